@@ -50,50 +50,62 @@ check_requirements() {
     
     print_status "Using Python: $($python_cmd --version)"
     
-    # Check if we can import the required modules
-    if ! $python_cmd -c "import dotenv" &> /dev/null; then
-        print_warning "python-dotenv not found. Installing..."
-        $python_cmd -m pip install python-dotenv
+    # Skip the package scan if it already passed for this interpreter; the marker
+    # goes stale when the interpreter binary is replaced (upgrade, new venv).
+    # Delete ~/.cache/udba/prereqs.ok to force a rescan.
+    local python_path
+    python_path=$(command -v "$python_cmd")
+    local prereq_marker="$HOME/.cache/udba/prereqs.ok"
+    if [ -f "$prereq_marker" ] && [ "$prereq_marker" -nt "$python_path" ] \
+        && [ "$(cat "$prereq_marker")" = "$python_path" ]; then
+        PYTHON_CMD="$python_cmd"
+        print_status "All requirements satisfied (cached)!"
+        return
     fi
     
-    if ! $python_cmd -c "import pandas" &> /dev/null; then
-        print_warning "pandas not found. Installing..."
-        $python_cmd -m pip install pandas
-    fi
-    
-    if ! $python_cmd -c "import matplotlib" &> /dev/null; then
-        print_warning "matplotlib not found. Installing..."
-        $python_cmd -m pip install matplotlib
-    fi
-    
-    if ! $python_cmd -c "import seaborn" &> /dev/null; then
-        print_warning "seaborn not found. Installing..."
-        $python_cmd -m pip install seaborn
-    fi
-    
-    if ! $python_cmd -c "import sqlalchemy" &> /dev/null; then
-        print_warning "sqlalchemy not found. Installing..."
-        $python_cmd -m pip install sqlalchemy
-    fi
-    
-    if ! $python_cmd -c "import pymongo" &> /dev/null; then
-        print_warning "pymongo not found. Installing..."
-        $python_cmd -m pip install pymongo
-    fi
-    
-    if ! $python_cmd -c "import google.generativeai" &> /dev/null; then
-        print_warning "google-generativeai not found. Installing..."
-        $python_cmd -m pip install google-generativeai
+    # Find missing modules in a single interpreter launch; find_spec locates
+    # each package without importing it. A failed or interrupted scan must
+    # not be cached as a pass
+    local missing_packages=""
+    local scan_ok=1
+    if ! missing_packages=$($python_cmd - <<'PYEOF'
+import importlib.util
+
+# module name -> pip package name
+REQUIRED = {
+    "dotenv": "python-dotenv",
+    "pandas": "pandas",
+    "matplotlib": "matplotlib",
+    "seaborn": "seaborn",
+    "sqlalchemy": "sqlalchemy",
+    "pymongo": "pymongo",
+    "google.generativeai": "google-generativeai",
+    "plotly": "plotly",
+    "networkx": "networkx",
+}
+
+def is_installed(module):
+    try:
+        return importlib.util.find_spec(module) is not None
+    except ModuleNotFoundError:
+        # Parent package (e.g. "google") is missing
+        return False
+
+print(" ".join(pkg for mod, pkg in REQUIRED.items() if not is_installed(mod)))
+PYEOF
+); then
+        scan_ok=0
+        print_warning "Package scan failed; requirements will be rechecked next run"
     fi
     
-    if ! $python_cmd -c "import plotly" &> /dev/null; then
-        print_warning "plotly not found. Installing..."
-        $python_cmd -m pip install plotly
-    fi
+    local install_failed=0
+    for package in $missing_packages; do
+        print_warning "$package not found. Installing..."
+        $python_cmd -m pip install "$package" || install_failed=1
+    done
     
-    if ! $python_cmd -c "import networkx" &> /dev/null; then
-        print_warning "networkx not found. Installing..."
-        $python_cmd -m pip install networkx
+    if [ "$scan_ok" -eq 1 ] && [ "$install_failed" -eq 0 ]; then
+        mkdir -p "$(dirname "$prereq_marker")" && echo "$python_path" > "$prereq_marker"
     fi
     
     # Store the python command for later use
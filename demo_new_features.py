@@ -14,87 +14,90 @@ if project_root not in sys.path:
 
 def demo_graph_embedding():
     """Demonstrate the new graph embedding functionality"""
+    out = []
     
-    print("🎯 Graph Embedding Feature Demonstration")
-    print("=" * 50)
+    out.append("🎯 Graph Embedding Feature Demonstration")
+    out.append("=" * 50)
     
-    print("\n🚀 What's New:")
-    print("1. Graphs are now embedded directly in markdown files")
-    print("2. Bash script to analyze all databases automatically")
-    print("3. Better file organization with embedded visualizations")
+    out.append("\n🚀 What's New:")
+    out.append("1. Graphs are now embedded directly in markdown files")
+    out.append("2. Bash script to analyze all databases automatically")
+    out.append("3. Better file organization with embedded visualizations")
     
-    print("\n📁 Current Project Structure:")
-    print("├── New_DB/                           # Your database files")
-    print("│   ├── sakila.db")
-    print("│   ├── Chinook_Sqlite.sqlite")
-    print("│   └── superheroes.db")
-    print("├── consolidated_analysis/            # Analysis results")
-    print("│   ├── sakila_consolidated_analysis.md")
-    print("│   ├── sakila_graphs/                # Graph images (NEW!)")
-    print("│   └── ...")
-    print("├── analyze_all_databases.sh          # NEW: Auto-analysis script")
-    print("└── test_graph_embedding.py           # NEW: Testing script")
+    out.append("\n📁 Current Project Structure:")
+    out.append("├── New_DB/                           # Your database files")
+    out.append("│   ├── sakila.db")
+    out.append("│   ├── Chinook_Sqlite.sqlite")
+    out.append("│   └── superheroes.db")
+    out.append("├── consolidated_analysis/            # Analysis results")
+    out.append("│   ├── sakila_consolidated_analysis.md")
+    out.append("│   ├── sakila_graphs/                # Graph images (NEW!)")
+    out.append("│   └── ...")
+    out.append("├── analyze_all_databases.sh          # NEW: Auto-analysis script")
+    out.append("└── test_graph_embedding.py           # NEW: Testing script")
     
-    print("\n🛠️ How to Use:")
-    print("\nOption 1: Use the new bash script (Recommended)")
-    print("  ./analyze_all_databases.sh")
-    print("  → Analyzes all databases in New_DB folder")
-    print("  → Generates consolidated reports with embedded graphs")
-    print("  → Interactive menu for viewing results")
+    out.append("\n🛠️ How to Use:")
+    out.append("\nOption 1: Use the new bash script (Recommended)")
+    out.append("  ./analyze_all_databases.sh")
+    out.append("  → Analyzes all databases in New_DB folder")
+    out.append("  → Generates consolidated reports with embedded graphs")
+    out.append("  → Interactive menu for viewing results")
     
-    print("\nOption 2: Manual analysis")
-    print("  python3 universal_database_analyzer.py 'New_DB/sakila.db' 'sakila'")
-    print("  → Analyzes single database")
-    print("  → Creates consolidated report with embedded graphs")
+    out.append("\nOption 2: Manual analysis")
+    out.append("  python3 universal_database_analyzer.py 'New_DB/sakila.db' 'sakila'")
+    out.append("  → Analyzes single database")
+    out.append("  → Creates consolidated report with embedded graphs")
     
-    print("\n📊 What You'll See:")
-    print("• Executive summary with AI insights")
-    print("• Business domain analysis")
-    print("• Data model architecture")
-    print("• Performance recommendations")
-    print("• EMBEDDED GRAPHS showing:")
-    print("  - Table sizes and relationships")
-    print("  - Business domain visualization")
-    print("  - Performance characteristics")
-    print("  - Data type distribution")
-    print("  - Foreign key relationships")
-    print("  - Index analysis")
-    print("  - Entity relationship diagrams")
-    print("  - Schema overview")
+    out.append("\n📊 What You'll See:")
+    out.append("• Executive summary with AI insights")
+    out.append("• Business domain analysis")
+    out.append("• Data model architecture")
+    out.append("• Performance recommendations")
+    out.append("• EMBEDDED GRAPHS showing:")
+    out.append("  - Table sizes and relationships")
+    out.append("  - Business domain visualization")
+    out.append("  - Performance characteristics")
+    out.append("  - Data type distribution")
+    out.append("  - Foreign key relationships")
+    out.append("  - Index analysis")
+    out.append("  - Entity relationship diagrams")
+    out.append("  - Schema overview")
     
-    print("\n🎯 Benefits:")
-    print("✅ One-click analysis of all databases")
-    print("✅ Visual insights directly in reports")
-    print("✅ Better organization and sharing")
-    print("✅ Professional-looking analysis documents")
+    out.append("\n🎯 Benefits:")
+    out.append("✅ One-click analysis of all databases")
+    out.append("✅ Visual insights directly in reports")
+    out.append("✅ Better organization and sharing")
+    out.append("✅ Professional-looking analysis documents")
     
-    print("\n🧪 Test the Features:")
-    print("1. Run: ./analyze_all_databases.sh")
-    print("2. Choose option 1 to analyze all databases")
-    print("3. Wait for analysis to complete")
-    print("4. Choose option 3 to open a specific report")
-    print("5. See graphs embedded directly in the markdown!")
+    out.append("\n🧪 Test the Features:")
+    out.append("1. Run: ./analyze_all_databases.sh")
+    out.append("2. Choose option 1 to analyze all databases")
+    out.append("3. Wait for analysis to complete")
+    out.append("4. Choose option 3 to open a specific report")
+    out.append("5. See graphs embedded directly in the markdown!")
     
-    print("\n📝 Example Output After Analysis:")
-    print("📋 Generating consolidated report for sakila...")
-    print("   📊 Copied table_sizes graph: sakila_table_sizes.png")
-    print("   📊 Copied business_domain graph: sakila_business_domain.png")
-    print("   📊 Copied performance graph: sakila_performance.png")
-    print("   📊 Copied data_types graph: sakila_data_types.png")
-    print("   📊 Copied foreign_keys graph: sakila_foreign_keys.png")
-    print("   📊 Copied index_analysis graph: sakila_index_analysis.png")
-    print("   📊 Copied entity_relationship graph: sakila_entity_relationship.png")
-    print("   📊 Copied schema_overview graph: sakila_schema_overview.png")
-    print("✅ Consolidated report generated with embedded graphs!")
+    out.append("\n📝 Example Output After Analysis:")
+    out.append("📋 Generating consolidated report for sakila...")
+    out.append("   📊 Copied table_sizes graph: sakila_table_sizes.png")
+    out.append("   📊 Copied business_domain graph: sakila_business_domain.png")
+    out.append("   📊 Copied performance graph: sakila_performance.png")
+    out.append("   📊 Copied data_types graph: sakila_data_types.png")
+    out.append("   📊 Copied foreign_keys graph: sakila_foreign_keys.png")
+    out.append("   📊 Copied index_analysis graph: sakila_index_analysis.png")
+    out.append("   📊 Copied entity_relationship graph: sakila_entity_relationship.png")
+    out.append("   📊 Copied schema_overview graph: sakila_schema_overview.png")
+    out.append("✅ Consolidated report generated with embedded graphs!")
     
-    print("\n🔍 Troubleshooting:")
-    print("• Make sure you have a .env file with GEMINI_API_KEY")
-    print("• Run: python3 test_graph_embedding.py to verify setup")
-    print("• Check: chmod +x analyze_all_databases.sh for permissions")
+    out.append("\n🔍 Troubleshooting:")
+    out.append("• Make sure you have a .env file with GEMINI_API_KEY")
+    out.append("• Run: python3 test_graph_embedding.py to verify setup")
+    out.append("• Check: chmod +x analyze_all_databases.sh for permissions")
     
-    print("\n" + "="*50)
-    print("🎉 Ready to try the new features!")
-    print("Run './analyze_all_databases.sh' to get started!")
+    out.append("\n" + "="*50)
+    out.append("🎉 Ready to try the new features!")
+    out.append("Run './analyze_all_databases.sh' to get started!")
+    
+    sys.stdout.write("\n".join(out) + "\n")
 
 if __name__ == "__main__":
     demo_graph_embedding()
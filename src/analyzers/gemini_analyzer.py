@@ -1,114 +1,57 @@
 import google.generativeai as genai
+import asyncio
+import hashlib
 import json
-from typing import Dict, Any
+import threading
+import time
+from itertools import islice
+from typing import Dict, Any, Optional, Tuple
 import logging
 from dataclasses import dataclass
 
-@dataclass
-class GeminiConfig:
-    api_key: str
-    model_name: str = "gemini-1.5-flash"  # Changed from gemini-1.5-pro to gemini-1.5-flash
-    temperature: float = 0.1
-    max_output_tokens: int = 8192
+from google.api_core import exceptions as google_exceptions
+from google.api_core import retry as google_retry
+from google.api_core import retry_async as google_retry_async
 
-class GeminiSchemaAnalyzer:
-    def __init__(self, config: GeminiConfig):
-        self.config = config
-        self.logger = logging.getLogger(__name__)
-        
-        genai.configure(api_key=config.api_key)
-        self.model = genai.GenerativeModel(
-            model_name=config.model_name,
-            generation_config=genai.types.GenerationConfig(
-                temperature=config.temperature,
-                max_output_tokens=config.max_output_tokens,
-            )
-        )
-    
-    def analyze_schema(self, schema_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Analyze database schema using Gemini"""
-        self.logger.info("Starting Gemini schema analysis")
-        
-        try:
-            prompt = self._build_analysis_prompt(schema_data)
-            response = self.model.generate_content(prompt)
-            analysis = self._parse_response(response.text)
-            
-            self.logger.info("Schema analysis completed successfully")
-            return analysis
-            
-        except Exception as e:
-            self.logger.error(f"Error in schema analysis: {e}")
-            return self._create_error_response(str(e))
-    
-    def _build_analysis_prompt(self, schema_data: Dict[str, Any]) -> str:
-        """Build comprehensive analysis prompt for reverse engineering"""
-        
-        # Extract detailed schema information
-        detailed_schema = {}
-        tables = schema_data.get('tables', {})
-        
-        for table_name, table_data in list(tables.items())[:15]:  # Increased limit
-            columns = table_data.get('columns', [])
-            foreign_keys = table_data.get('foreign_keys', [])
-            indexes = table_data.get('indexes', [])
-            primary_keys = table_data.get('primary_keys', {})
-            
-            detailed_schema[table_name] = {
-                'column_count': len(columns),
-                'columns': [
-                    {
-                        'name': col.get('name'),
-                        'type': str(col.get('type')),
-                        'nullable': col.get('nullable', True),
-                        'default': col.get('default'),
-                        'comment': col.get('comment', '')
-                    } for col in columns
-                ],
-                'row_count': table_data.get('row_count', 0),
-                'foreign_keys': foreign_keys,
-                'indexes': indexes,
-                'primary_keys': primary_keys.get('constrained_columns', [])
-            }
-        
-        prompt = f"""
-You are an expert database reverse engineer and data architect. Perform a DEEP ANALYSIS of this database schema for reverse engineering purposes.
+from .response_cache import ResponseCache
 
-Database Type: {schema_data.get('database_type', 'sqlite')}
-Total Tables: {len(tables)}
-Detailed Schema: {json.dumps(detailed_schema, indent=2, default=str)}
+# Shared decoder for pulling the JSON object out of model responses
+_JSON_DECODER = json.JSONDecoder()
 
-Provide a COMPREHENSIVE analysis in this exact JSON format:
+# Reusable encoders: compact schema JSON for prompts, and a key-sorted form for cache keys
+_SCHEMA_ENCODER = json.JSONEncoder(default=str, separators=(',', ':'), ensure_ascii=False)
+_CANONICAL_ENCODER = json.JSONEncoder(default=str, separators=(',', ':'), ensure_ascii=False, sort_keys=True)
 
-{{
-  "reverse_engineering_analysis": {{
-    "business_domain_identification": {{
+# Expected answer shape shown to the model; indented here for reading, sent compact
+_ANALYSIS_RESPONSE_EXAMPLE = """{
+  "reverse_engineering_analysis": {
+    "business_domain_identification": {
       "primary_domain": "e-commerce",
       "sub_domains": ["customer_management", "order_processing", "product_catalog"],
       "confidence_score": 95,
       "domain_evidence": ["Table names like 'orders', 'customers'", "Foreign key relationships"],
       "business_processes": ["Customer registration", "Order placement", "Product management"]
-    }},
-    "data_model_architecture": {{
+    },
+    "data_model_architecture": {
       "design_pattern": "Entity-Relationship Model",
       "normalization_level": "3NF",
       "architectural_style": "Traditional Relational",
       "flexibility_score": 75,
       "scalability_indicators": ["Proper indexing", "Normalized structure"]
-    }},
-    "entity_relationship_mapping": {{
+    },
+    "entity_relationship_mapping": {
       "core_entities": [
-        {{
+        {
           "entity_name": "Customer",
           "table_name": "customers",
           "key_attributes": ["customer_id", "email"],
           "business_purpose": "Store customer information and track customer behavior",
           "data_volume": "Medium",
           "update_frequency": "Low"
-        }}
+        }
       ],
       "relationships": [
-        {{
+        {
           "relationship_name": "Customer-Orders",
           "parent_entity": "Customer",
           "child_entity": "Order", 
@@ -116,56 +59,56 @@ Provide a COMPREHENSIVE analysis in this exact JSON format:
           "business_meaning": "A customer can place multiple orders",
           "cardinality": "1:N",
           "foreign_key": "orders.customer_id -> customers.customer_id"
-        }}
+        }
       ],
-      "entity_hierarchy": {{
+      "entity_hierarchy": {
         "master_entities": ["Customer", "Product"],
         "transaction_entities": ["Order", "OrderItem"],
         "reference_entities": ["Category", "Status"]
-      }}
-    }}
-  }},
-  "metadata_extraction": {{
-    "table_purposes": {{
+      }
+    }
+  },
+  "metadata_extraction": {
+    "table_purposes": {
       "customers": "Primary customer data storage with contact and behavioral information",
       "orders": "Order transaction records with financial and status tracking",
       "products": "Product catalog with pricing and inventory information"
-    }},
-    "column_semantics": {{
+    },
+    "column_semantics": {
       "customer_id": "Primary identifier for customer records",
       "email": "Unique customer contact and login identifier", 
       "order_id": "Primary identifier for order transactions",
       "total_price": "Monetary value representing order total"
-    }},
-    "data_patterns": {{
+    },
+    "data_patterns": {
       "identifier_patterns": ["Auto-incrementing IDs", "UUID patterns"],
       "naming_conventions": ["snake_case for tables", "camelCase for some columns"],
       "data_type_patterns": ["DECIMAL for monetary values", "TIMESTAMP for dates"]
-    }},
+    },
     "business_rules_inferred": [
       "Customers must have unique email addresses",
       "Orders must be associated with valid customers",
       "Products have fixed pricing structure"
     ]
-  }},
-  "data_quality_assessment": {{
-    "integrity_analysis": {{
+  },
+  "data_quality_assessment": {
+    "integrity_analysis": {
       "referential_integrity": "Well-maintained with foreign key constraints",
       "data_consistency": "High - proper normalization",
       "completeness_score": 85,
       "accuracy_indicators": ["Proper data types", "Constraint enforcement"]
-    }},
+    },
     "quality_issues": [
       "Potential missing indexes on frequently queried columns",
       "Some nullable fields that should be required"
     ],
-    "data_governance": {{
+    "data_governance": {
       "pii_handling": "Email addresses stored - consider encryption",
       "audit_trail": "Basic timestamp tracking available",
       "data_retention": "No explicit retention policies visible"
-    }}
-  }},
-  "performance_analysis": {{
+    }
+  },
+  "performance_analysis": {
     "query_patterns": [
       "Customer order history lookups",
       "Product catalog browsing with filtering",
@@ -180,26 +123,26 @@ Provide a COMPREHENSIVE analysis in this exact JSON format:
       "Implement query result caching",
       "Consider read replicas for reporting"
     ],
-    "scalability_assessment": {{
+    "scalability_assessment": {
       "current_capacity": "Medium scale - suitable for small to medium business",
       "scaling_challenges": ["Single database instance", "Limited partitioning"],
       "scaling_recommendations": ["Implement sharding strategy", "Add caching layer"]
-    }}
-  }},
-  "use_case_analysis": {{
+    }
+  },
+  "use_case_analysis": {
     "primary_use_cases": [
-      {{
+      {
         "use_case": "Customer Management",
         "description": "Complete customer lifecycle from registration to order history",
         "data_entities": ["Customer", "Order"],
         "business_value": "Customer relationship management and analytics"
-      }},
-      {{
+      },
+      {
         "use_case": "Order Processing", 
         "description": "End-to-end order management from creation to fulfillment",
         "data_entities": ["Order", "OrderItem", "Product"],
         "business_value": "Revenue tracking and operational efficiency"
-      }}
+      }
     ],
     "analytics_opportunities": [
       "Customer behavior analysis",
@@ -213,8 +156,8 @@ Provide a COMPREHENSIVE analysis in this exact JSON format:
       "Customer support system",
       "Marketing automation platform"
     ]
-  }},
-  "technical_debt_assessment": {{
+  },
+  "technical_debt_assessment": {
     "immediate_concerns": [
       "Missing indexes on foreign keys",
       "No explicit data validation constraints"
@@ -227,37 +170,211 @@ Provide a COMPREHENSIVE analysis in this exact JSON format:
       "Microservices architecture migration",
       "Event-driven data architecture"
     ]
-  }},
-  "migration_insights": {{
+  },
+  "migration_insights": {
     "complexity_assessment": "Medium complexity - well-structured but needs optimization",
     "migration_effort": "2-3 months for complete migration",
     "risk_factors": ["Data volume", "Downtime requirements"],
     "migration_strategy": "Phased migration with parallel systems"
-  }}
-}}
+  }
+}"""
+_COMPACT_RESPONSE_EXAMPLE = json.dumps(json.loads(_ANALYSIS_RESPONSE_EXAMPLE), separators=(',', ':'), ensure_ascii=False)
+
+# Reverse-engineering prompt, filled per schema by _build_analysis_prompt
+_ANALYSIS_PROMPT_TEMPLATE = """
+You are an expert database reverse engineer and data architect. Perform a DEEP ANALYSIS of this database schema for reverse engineering purposes.
+
+Database Type: {database_type}
+Total Tables: {table_count}
+Detailed Schema (each column is [name, type, nullable, default, comment]): {schema_json}
+
+Provide a COMPREHENSIVE analysis in this exact JSON format:
+
+{response_example}
 
 Focus on providing DEEP INSIGHTS that would help engineers understand the data model, business logic, and potential use cases without manual exploration. Be specific about relationships, data patterns, and business rules inferred from the schema structure.
 """
+
+# Gemini errors worth retrying: rate limiting, overload and timeouts
+_TRANSIENT_GEMINI_ERRORS = google_retry.if_exception_type(
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.InternalServerError,
+)
+
+# Exponential backoff (1s, 2s, 4s ... capped at 30s) within a 3 minute budget per call
+GEMINI_RETRY = google_retry.Retry(predicate=_TRANSIENT_GEMINI_ERRORS, initial=1.0, maximum=30.0,
+                                  multiplier=2.0, timeout=180.0)
+GEMINI_ASYNC_RETRY = google_retry_async.AsyncRetry(predicate=_TRANSIENT_GEMINI_ERRORS, initial=1.0, maximum=30.0,
+                                                   multiplier=2.0, timeout=180.0)
+
+# API key genai was last configured with; configure() drops the SDK's cached clients, so skip repeats
+_configured_api_key: Optional[str] = None
+
+def configure_gemini(api_key: str):
+    """Configure the genai SDK once per API key so analyzers share its cached client and channel"""
+    global _configured_api_key
+    if _configured_api_key != api_key:
+        genai.configure(api_key=api_key)
+        _configured_api_key = api_key
+
+class RequestPacer:
+    """Spaces Gemini requests evenly to stay under a requests-per-minute quota; safe across threads and coroutines"""
+    
+    def __init__(self, requests_per_minute: int):
+        self._interval = 60.0 / requests_per_minute
+        self._next_slot = 0.0
+        self._lock = threading.Lock()
+    
+    def _reserve(self) -> float:
+        """Claim the next free send slot and return the seconds until it"""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self._interval
+            return slot - now
+    
+    def wait(self):
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+    
+    async def wait_async(self):
+        delay = self._reserve()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+# One pacer per (API key, quota) so every analyzer on the same account shares its budget
+_request_pacers: Dict[Tuple[str, int], RequestPacer] = {}
+_request_pacers_lock = threading.Lock()
+
+def get_request_pacer(api_key: str, requests_per_minute: Optional[int]) -> Optional[RequestPacer]:
+    """Return the shared pacer for an account, or None when no quota is configured"""
+    if not requests_per_minute:
+        return None
+    with _request_pacers_lock:
+        key = (api_key, requests_per_minute)
+        if key not in _request_pacers:
+            _request_pacers[key] = RequestPacer(requests_per_minute)
+        return _request_pacers[key]
+
+@dataclass
+class GeminiConfig:
+    api_key: str
+    model_name: str = "gemini-1.5-flash"  # Changed from gemini-1.5-pro to gemini-1.5-flash
+    temperature: float = 0.1
+    max_output_tokens: int = 8192
+    cache_dir: Optional[str] = "~/.cache/udba"  # Set to None to disable the on-disk response cache
+    cache_ttl: Optional[float] = None  # Seconds before a cached response is re-requested; None never expires
+    requests_per_minute: Optional[int] = None  # Account quota to pace requests under; None sends immediately
+    light_model_name: Optional[str] = None  # e.g. "gemini-1.5-flash-8b" for the narrower pattern analyses
+
+class GeminiSchemaAnalyzer:
+    # Part of the response cache key; bump whenever _build_analysis_prompt changes
+    PROMPT_VERSION = 5
+    
+    def __init__(self, config: GeminiConfig):
+        self.config = config
+        self.logger = logging.getLogger(__name__)
+        self._cache = ResponseCache(config.cache_dir, config.cache_ttl)
+        self._pacer = get_request_pacer(config.api_key, config.requests_per_minute)
         
-        return prompt
+        configure_gemini(config.api_key)
+        self.model = genai.GenerativeModel(
+            model_name=config.model_name,
+            generation_config=genai.types.GenerationConfig(
+                temperature=config.temperature,
+                max_output_tokens=config.max_output_tokens,
+                response_mime_type="application/json",
+            )
+        )
+    
+    def analyze_schema(self, schema_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Analyze database schema using Gemini"""
+        self.logger.info("Starting Gemini schema analysis")
+        
+        try:
+            cache_key = self._cache_key(schema_data)
+            
+            cached = self._cache.get(cache_key)
+            if cached is not None:
+                self.logger.info("Using cached schema analysis")
+                return cached
+            
+            prompt = self._build_analysis_prompt(schema_data)
+            if self._pacer:
+                self._pacer.wait()
+            response = self.model.generate_content(prompt, request_options={'retry': GEMINI_RETRY})
+            analysis = self._parse_response(response.text)
+            
+            # Only cache well-formed answers so a bad parse is retried next run
+            if 'fallback_note' not in analysis:
+                self._cache.put(cache_key, analysis)
+            
+            self.logger.info("Schema analysis completed successfully")
+            return analysis
+            
+        except Exception as e:
+            self.logger.error("Error in schema analysis: %s", e)
+            return self._create_error_response(str(e))
+    
+    def _cache_key(self, schema_data: Dict[str, Any]) -> str:
+        """Build the response cache key from the canonical schema JSON and the generation settings"""
+        canonical_schema = _CANONICAL_ENCODER.encode(schema_data)
+        material = (f"{self.PROMPT_VERSION}|{self.config.model_name}|{self.config.temperature}|"
+                    f"{self.config.max_output_tokens}|{canonical_schema}")
+        return hashlib.blake2b(material.encode('utf-8'), digest_size=16).hexdigest()
+    
+    def _build_analysis_prompt(self, schema_data: Dict[str, Any]) -> str:
+        """Build comprehensive analysis prompt for reverse engineering"""
+        
+        # Extract detailed schema information
+        detailed_schema = {}
+        tables = schema_data.get('tables', {})
+        
+        for table_name, table_data in islice(tables.items(), 15):  # Increased limit
+            columns = table_data.get('columns', [])
+            foreign_keys = table_data.get('foreign_keys', [])
+            indexes = table_data.get('indexes', [])
+            primary_keys = table_data.get('primary_keys', {})
+            
+            detailed_schema[table_name] = {
+                'column_count': len(columns),
+                # Positional rows instead of dicts so the column keys aren't repeated for every column
+                'columns': [
+                    [col.get('name'), str(col.get('type')), col.get('nullable', True),
+                     col.get('default'), col.get('comment', '')]
+                    for col in columns
+                ],
+                'row_count': table_data.get('row_count', 0),
+                'foreign_keys': foreign_keys,
+                'indexes': indexes,
+                'primary_keys': primary_keys.get('constrained_columns', [])
+            }
+        
+        return _ANALYSIS_PROMPT_TEMPLATE.format_map({
+            'database_type': schema_data.get('database_type', 'sqlite'),
+            'table_count': len(tables),
+            'schema_json': _SCHEMA_ENCODER.encode(detailed_schema),
+            'response_example': _COMPACT_RESPONSE_EXAMPLE,
+        })
     
     def _parse_response(self, response_text: str) -> Dict[str, Any]:
         """Parse Gemini's JSON response"""
         try:
             response_text = response_text.strip()
             
-            # Find JSON boundaries
+            # Decode the first complete object from the opening brace; trailing prose is never scanned
             start_idx = response_text.find('{')
-            end_idx = response_text.rfind('}')
-            
-            if start_idx != -1 and end_idx != -1:
-                json_text = response_text[start_idx:end_idx + 1]
-                return json.loads(json_text)
+            if start_idx != -1:
+                analysis, _ = _JSON_DECODER.raw_decode(response_text, start_idx)
+                return analysis
             
             return json.loads(response_text)
             
         except json.JSONDecodeError as e:
-            self.logger.error(f"Failed to parse JSON response: {e}")
+            self.logger.error("Failed to parse JSON response: %s", e)
             return self._create_fallback_analysis(response_text)
     
     def _create_fallback_analysis(self, response_text: str) -> Dict[str, Any]:
@@ -0,0 +1,93 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+
+class ResponseCache:
+    """Two-level (memory, then JSON files on disk) cache for parsed Gemini responses"""
+    
+    def __init__(self, cache_dir: Optional[str] = None, ttl: Optional[float] = None, max_entries: int = 256):
+        self.cache_dir = os.path.expanduser(cache_dir) if cache_dir else None
+        self.ttl = ttl  # Seconds an entry stays valid; None keeps entries forever
+        self.max_entries = max_entries  # Responses kept in memory; the least recently used are evicted
+        self.logger = logging.getLogger(__name__)
+        # key -> (stored_at, JSON text); kept serialized so every hit decodes a fresh copy for the caller
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _path(self, key: str) -> Optional[str]:
+        """Return the on-disk cache file for a key, or None when disk caching is disabled"""
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, f"{key}.json")
+    
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Look up a previous response in memory, then on disk"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+        if entry is not None:
+            return json.loads(entry[1]) if not self._expired(entry[0]) else None
+        
+        path = self._path(key)
+        if not path:
+            return None
+        
+        try:
+            stored_at = os.path.getmtime(path)
+            if self._expired(stored_at):
+                return None
+            with open(path, 'r', encoding='utf-8') as f:
+                text = f.read()
+            value = json.loads(text)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            self.logger.warning("Ignoring unreadable cache entry %s: %s", path, e)
+            return None
+        
+        self._remember(key, stored_at, text)
+        return value
+    
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl is not None and time.time() - stored_at > self.ttl
+    
+    def _remember(self, key: str, stored_at: float, text: str):
+        """Store an entry in memory, evicting the least recently used ones beyond max_entries"""
+        with self._lock:
+            self._memory[key] = (stored_at, text)
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+    
+    def put(self, key: str, value: Dict[str, Any]):
+        """Remember a response in memory and persist it atomically on disk"""
+        text = json.dumps(value, ensure_ascii=False)
+        self._remember(key, time.time(), text)
+        
+        path = self._path(key)
+        if not path:
+            return
+        
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        except OSError as e:
+            self.logger.warning("Could not write cache entry %s: %s", path, e)
+            return
+        
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(text)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.logger.warning("Could not write cache entry %s: %s", path, e)
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
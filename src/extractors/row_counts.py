@@ -0,0 +1,52 @@
+"""
+Batched table row counting over a DB-API connection
+"""
+
+import logging
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Tables counted per UNION ALL query; stays well below SQLite's 500-term compound SELECT limit
+ROW_COUNT_BATCH_SIZE = 100
+
+def count_rows(conn, table_names: List[str], quote: Callable[[str], str]) -> Dict[str, Optional[int]]:
+    """
+    Count rows with one UNION ALL query per batch of tables, falling back to per-table counts.
+    
+    conn is any DB-API connection (sqlite3, or engine.raw_connection() for SQLAlchemy) and quote
+    renders a table name as an identifier for its dialect. Failed queries roll conn back, so it should
+    hold no uncommitted work. Tables that cannot be counted map to None.
+    """
+    row_counts = {}
+    cursor = conn.cursor()
+    try:
+        for start in range(0, len(table_names), ROW_COUNT_BATCH_SIZE):
+            batch = table_names[start:start + ROW_COUNT_BATCH_SIZE]
+            query = " UNION ALL ".join(
+                f"SELECT {idx}, COUNT(*) FROM {quote(name)}" for idx, name in enumerate(batch)
+            )
+            try:
+                cursor.execute(query)
+                for idx, count in cursor.fetchall():
+                    row_counts[batch[idx]] = count
+            except Exception as e:
+                # Some backends abort the whole transaction on error, so reset before retrying
+                conn.rollback()
+                logger.warning("Batched row count failed, counting tables one by one: %s", e)
+                for name in batch:
+                    row_counts[name] = _count_table(conn, cursor, name, quote)
+    finally:
+        cursor.close()
+    
+    return row_counts
+
+def _count_table(conn, cursor, table_name: str, quote: Callable[[str], str]) -> Optional[int]:
+    """Count one table's rows, or None if the query fails"""
+    try:
+        cursor.execute(f"SELECT COUNT(*) FROM {quote(table_name)}")
+        return cursor.fetchone()[0]
+    except Exception as e:
+        conn.rollback()
+        logger.warning("Could not get row count for %s: %s", table_name, e)
+        return None
@@ -1,10 +1,18 @@
 import sqlalchemy as sa
-from sqlalchemy import inspect, text
+from sqlalchemy import inspect
 import pymongo
 import json
-from typing import Dict, List, Any, Optional
+import re
+from collections import Counter
+from itertools import chain, islice
+from typing import Dict, Iterable, List, Any, Optional
 import logging
 
+from .row_counts import count_rows
+
+# Column-name fragments that suggest personal data
+_PII_PATTERN = re.compile(r"email|phone|ssn|social|password|credit|card")
+
 class MultiDBSchemaExtractor:
     def __init__(self):
         self.logger = logging.getLogger(__name__)
@@ -12,8 +20,9 @@ class MultiDBSchemaExtractor:
     
     def extract_relational_schema(self, connection_string: str) -> Dict[str, Any]:
         """Extract schema from relational databases"""
+        engine = None
         try:
-            engine = sa.create_engine(connection_string)
+            engine = self._create_engine(connection_string)
             inspector = inspect(engine)
             
             schema_data = {
@@ -30,21 +39,33 @@ class MultiDBSchemaExtractor:
             
             # Extract table information
             table_names = inspector.get_table_names()
-            self.logger.info(f"Found {len(table_names)} tables")
+            self.logger.info("Found %d tables", len(table_names))
+            
+            # Count rows for all tables in a few batched queries
+            row_counts = self._get_row_counts(engine, table_names)
+            
+            # Reflect every table's details at once; dialects with bulk catalog queries
+            # (PostgreSQL, Oracle, ...) answer each of these in a single round-trip
+            all_columns = inspector.get_multi_columns(filter_names=table_names)
+            all_foreign_keys = inspector.get_multi_foreign_keys(filter_names=table_names)
+            all_primary_keys = inspector.get_multi_pk_constraint(filter_names=table_names)
+            all_indexes = inspector.get_multi_indexes(filter_names=table_names)
+            all_check_constraints = inspector.get_multi_check_constraints(filter_names=table_names)
+            all_unique_constraints = inspector.get_multi_unique_constraints(filter_names=table_names)
             
             for table_name in table_names:
-                self.logger.info(f"Processing table: {table_name}")
+                self.logger.info("Processing table: %s", table_name)
                 
-                # Get table details
-                columns = inspector.get_columns(table_name)
-                foreign_keys = inspector.get_foreign_keys(table_name)
-                primary_keys = inspector.get_pk_constraint(table_name)
-                indexes = inspector.get_indexes(table_name)
-                check_constraints = inspector.get_check_constraints(table_name)
-                unique_constraints = inspector.get_unique_constraints(table_name)
+                # Get table details (keyed by (schema, table); None is the default schema)
+                key = (None, table_name)
+                columns = all_columns[key]
+                foreign_keys = all_foreign_keys[key]
+                primary_keys = all_primary_keys[key]
+                indexes = all_indexes[key]
+                check_constraints = all_check_constraints[key]
+                unique_constraints = all_unique_constraints[key]
                 
-                # Get row count (safely)
-                row_count = self._get_row_count_safe(engine, table_name)
+                row_count = row_counts.get(table_name)
                 
                 # Analyze column patterns
                 column_analysis = self._analyze_columns(columns)
@@ -70,8 +91,26 @@ class MultiDBSchemaExtractor:
             return schema_data
             
         except Exception as e:
-            self.logger.error(f"Error extracting relational schema: {e}")
+            self.logger.error("Error extracting relational schema: %s", e)
             raise
+        finally:
+            if engine is not None:
+                engine.dispose()
+    
+    def _create_engine(self, connection_string: str):
+        """Create an engine, tuning SQLite connections for read-heavy schema scans"""
+        engine = sa.create_engine(connection_string)
+        
+        if engine.dialect.name == 'sqlite':
+            @sa.event.listens_for(engine, "connect")
+            def _set_sqlite_pragmas(dbapi_connection, connection_record):
+                cursor = dbapi_connection.cursor()
+                cursor.execute("PRAGMA mmap_size=268435456")
+                cursor.execute("PRAGMA cache_size=-65536")
+                cursor.execute("PRAGMA temp_store=MEMORY")
+                cursor.close()
+        
+        return engine
     
     def extract_mongodb_schema(self, connection_string: str, database_name: str) -> Dict[str, Any]:
         """Extract schema from MongoDB"""
@@ -88,10 +127,10 @@ class MultiDBSchemaExtractor:
             }
             
             collection_names = db.list_collection_names()
-            self.logger.info(f"Found {len(collection_names)} collections")
+            self.logger.info("Found %d collections", len(collection_names))
             
             for collection_name in collection_names:
-                self.logger.info(f"Processing collection: {collection_name}")
+                self.logger.info("Processing collection: %s", collection_name)
                 
                 collection = db[collection_name]
                 
@@ -101,11 +140,12 @@ class MultiDBSchemaExtractor:
                 except:
                     stats = {'count': 0, 'size': 0, 'avgObjSize': 0}
                 
-                # Sample documents to infer schema
-                sample_docs = list(collection.find().limit(100))
+                # Random sample picked server-side, streamed from the cursor; only the first 5 are kept
+                cursor = collection.aggregate([{'$sample': {'size': 100}}])
+                sample_docs = list(islice(cursor, 5))
                 
                 # Infer field structure
-                field_analysis = self._analyze_mongo_fields(sample_docs)
+                field_analysis = self._analyze_mongo_fields(chain(sample_docs, cursor))
                 
                 # Get indexes
                 collection_indexes = list(collection.list_indexes())
@@ -119,70 +159,52 @@ class MultiDBSchemaExtractor:
                 }
                 
                 # Store sample documents (first 5)
-                schema_data['sample_documents'][collection_name] = sample_docs[:5]
+                schema_data['sample_documents'][collection_name] = sample_docs
                 
             client.close()
             return schema_data
             
         except Exception as e:
-            self.logger.error(f"Error extracting MongoDB schema: {e}")
+            self.logger.error("Error extracting MongoDB schema: %s", e)
             raise
     
-    def _get_row_count_safe(self, engine, table_name: str) -> Optional[int]:
-        """Safely get row count for a table"""
+    def _get_row_counts(self, engine, table_names: List[str]) -> Dict[str, Optional[int]]:
+        """Count rows for all tables in a few batched queries over one pooled connection"""
+        conn = engine.raw_connection()
         try:
-            with engine.connect() as conn:
-                result = conn.execute(text(f"SELECT COUNT(*) FROM {table_name}"))
-                return result.scalar()
-        except Exception as e:
-            self.logger.warning(f"Could not get row count for {table_name}: {e}")
-            return None
+            return count_rows(conn, table_names, engine.dialect.identifier_preparer.quote)
+        finally:
+            conn.close()
     
     def _analyze_columns(self, columns: List[Dict]) -> Dict[str, Any]:
         """Analyze column patterns and characteristics"""
-        analysis = {
+        return {
             'total_columns': len(columns),
-            'data_types': {},
-            'nullable_columns': 0,
-            'potential_pii': [],
+            'data_types': dict(Counter(str(col['type']) for col in columns)),
+            'nullable_columns': sum(1 for col in columns if col.get('nullable', True)),
+            'potential_pii': [col['name'] for col in columns if _PII_PATTERN.search(col['name'].lower())],
             'naming_patterns': []
         }
-        
-        for col in columns:
-            # Count data types
-            col_type = str(col['type'])
-            analysis['data_types'][col_type] = analysis['data_types'].get(col_type, 0) + 1
-            
-            # Count nullable columns
-            if col.get('nullable', True):
-                analysis['nullable_columns'] += 1
-            
-            # Identify potential PII
-            col_name_lower = col['name'].lower()
-            pii_patterns = ['email', 'phone', 'ssn', 'social', 'password', 'credit', 'card']
-            if any(pattern in col_name_lower for pattern in pii_patterns):
-                analysis['potential_pii'].append(col['name'])
-        
-        return analysis
     
-    def _analyze_mongo_fields(self, documents: List[Dict]) -> Dict[str, Any]:
-        """Analyze MongoDB document fields"""
-        if not documents:
-            return {}
-        
+    def _analyze_mongo_fields(self, documents: Iterable[Dict]) -> Dict[str, Any]:
+        """Analyze MongoDB document fields in a single pass over the documents"""
         field_types = {}
         field_presence = {}
+        total_docs = 0
         
         for doc in documents:
+            total_docs += 1
             self._traverse_document(doc, field_types, field_presence, "")
         
+        if not total_docs:
+            return {}
+        
         # Calculate field statistics
-        total_docs = len(documents)
         field_stats = {}
         
         for field, types in field_types.items():
             field_stats[field] = {
-                'types': list(set(types)),
+                'types': [t.__name__ for t in types],
                 'presence_percentage': (field_presence[field] / total_docs) * 100,
                 'is_required': field_presence[field] == total_docs
             }
@@ -190,24 +212,32 @@ class MultiDBSchemaExtractor:
         return field_stats
     
     def _traverse_document(self, obj, field_types, field_presence, prefix):
-        """Recursively traverse MongoDB document structure"""
-        if isinstance(obj, dict):
-            for key, value in obj.items():
+        """Traverse MongoDB document structure depth-first with an explicit stack instead of recursion"""
+        obj = self._first_non_list(obj)
+        if not isinstance(obj, dict):
+            return
+        
+        stack = [(iter(obj.items()), prefix)]
+        while stack:
+            items, prefix = stack[-1]
+            for key, value in items:
                 field_name = f"{prefix}.{key}" if prefix else key
                 
-                # Track field presence
+                # Track field presence and types (type objects; names are taken once at the end)
                 field_presence[field_name] = field_presence.get(field_name, 0) + 1
-                
-                # Track field types
-                if field_name not in field_types:
-                    field_types[field_name] = []
-                
-                field_types[field_name].append(type(value).__name__)
-                
-                # Recurse into nested objects
-                if isinstance(value, (dict, list)):
-                    self._traverse_document(value, field_types, field_presence, field_name)
-        
-        elif isinstance(obj, list) and obj:
-            # Analyze first item in list
-            self._traverse_document(obj[0], field_types, field_presence, prefix)
+                field_types.setdefault(field_name, set()).add(type(value))
+                
+                # Descend into nested objects (lists via their first item); this level resumes afterwards
+                value = self._first_non_list(value)
+                if isinstance(value, dict):
+                    stack.append((iter(value.items()), field_name))
+                    break
+            else:
+                stack.pop()
+    
+    @staticmethod
+    def _first_non_list(value):
+        """Follow first items through (possibly nested) non-empty lists"""
+        while isinstance(value, list) and value:
+            value = value[0]
+        return value
@@ -7,16 +7,129 @@ Orchestrates the complete analysis pipeline for any database
 import os
 import json
 import logging
-import shutil
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 from pathlib import Path
 
 from .extractors.schema_extractor import MultiDBSchemaExtractor
 from .analyzers.gemini_analyzer import GeminiSchemaAnalyzer, GeminiConfig
 from .analyzers.pattern_analyzer import PatternAnalyzer
-from .visualizers.graph_generator import DatabaseGraphGenerator
-from .visualizers.consolidated_report_generator import ConsolidatedReportGenerator
+
+# json.dump and the chunked Markdown report write many small pieces; a large buffer turns them into a few write() syscalls
+_JSON_WRITE_BUFFER = 1 << 20
+
+# Closing recommendations and conclusion of the comprehensive Markdown report
+_REPORT_CLOSING = """
+## Recommendations
+
+### Immediate Actions
+1. **Data Quality Improvement:** Address identified data quality issues
+2. **Performance Optimization:** Implement missing indexes and query optimizations
+3. **Security Enhancement:** Implement proper PII handling and access controls
+
+### Medium-term Improvements
+1. **Architecture Modernization:** Consider microservices architecture
+2. **Integration Strategy:** Implement unified data model and API layer
+3. **Scalability Planning:** Design for horizontal scaling
+
+### Long-term Considerations
+1. **Event-driven Architecture:** Implement real-time data processing
+2. **Advanced Analytics:** Build comprehensive data warehouse
+3. **AI/ML Integration:** Leverage data for predictive analytics
+
+## Conclusion
+
+This reverse engineering analysis provides comprehensive insights into the data models, business logic, and integration opportunities across multiple database platforms. The findings can guide:
+- Platform migration strategies
+- Integration architecture design
+- Performance optimization efforts
+- Data governance implementation
+- Scalability planning
+
+The analysis demonstrates the value of automated schema analysis in understanding complex data ecosystems and accelerating engineering efforts.
+"""
+
+
+def _remove_tree(path: str):
+    """Delete a directory tree, unlinking each directory's files concurrently to overlap the syscalls"""
+    if os.path.islink(path):
+        # Same guard as shutil.rmtree: never delete through a symlinked root
+        raise OSError(f"Cannot remove a symbolic link as a tree: {path}")
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        for root, dirs, files in os.walk(path, topdown=False):
+            list(executor.map(os.unlink, [os.path.join(root, name) for name in files]))
+            for name in dirs:
+                dir_path = os.path.join(root, name)
+                # os.walk lists symlinks to directories under dirs; remove the link, not its target
+                if os.path.islink(dir_path):
+                    os.unlink(dir_path)
+                else:
+                    os.rmdir(dir_path)
+    os.rmdir(path)
+
+
+def _render_database_reports(graph_dir: str, consolidated_dir: str, db_name: str,
+                             result: Dict[str, Any]) -> List[Tuple[int, str]]:
+    """
+    Render one database's graphs, HTML report and consolidated report.
+    
+    Module-level so it can run in a worker process; returns (level, message) log records
+    for the parent to emit, since workers do not share its logging setup.
+    """
+    # Imported here so the Matplotlib/Plotly/NetworkX stack only loads where reports are rendered
+    from .visualizers.graph_generator import DatabaseGraphGenerator
+    from .visualizers.consolidated_report_generator import ConsolidatedReportGenerator
+    
+    messages = []
+    
+    # Get database path from connection string
+    connection_string = result['config']['connection_string']
+    if connection_string.startswith('sqlite:///'):
+        db_path = connection_string.replace('sqlite:///', '')
+    else:
+        db_path = connection_string
+    
+    try:
+        graph_generator = DatabaseGraphGenerator(output_dir=graph_dir)
+        graph_generator.set_database(db_path, result['analysis'])
+        
+        # Generate all graphs
+        graph_files = graph_generator.generate_all_graphs(db_name)
+        
+        # Generate HTML report
+        if graph_files:
+            html_report = graph_generator.generate_html_report(db_name, graph_files)
+            if html_report:
+                messages.append((logging.INFO, f"Generated HTML report: {html_report}"))
+    
+    except Exception as e:
+        messages.append((logging.ERROR, f"Error generating graphs for {db_name}: {e}"))
+    
+    try:
+        # Get graph files in one directory pass (no separate existence check)
+        graph_files = {}
+        prefix = f"{db_name}_"
+        try:
+            with os.scandir(graph_dir) as entries:
+                for entry in entries:
+                    if entry.name.startswith(prefix) and entry.name.endswith('.png'):
+                        graph_type = entry.name.replace(prefix, "").replace('.png', '')
+                        graph_files[graph_type] = entry.path
+        except FileNotFoundError:
+            pass
+        
+        # Generate consolidated report
+        consolidated_file = ConsolidatedReportGenerator(output_dir=consolidated_dir).generate_consolidated_report(
+            db_path, db_name, result, graph_files
+        )
+        messages.append((logging.INFO, f"Generated consolidated report: {consolidated_file}"))
+    
+    except Exception as e:
+        messages.append((logging.ERROR, f"Error generating consolidated report for {db_name}: {e}"))
+    
+    return messages
 
 class DatabaseAnalyzer:
     """Main orchestrator for database analysis"""
@@ -35,8 +148,8 @@ class DatabaseAnalyzer:
         
         self.gemini_analyzer = GeminiSchemaAnalyzer(gemini_config)
         self.pattern_analyzer = PatternAnalyzer(gemini_config)
-        self.graph_generator = DatabaseGraphGenerator(output_dir=f"{output_dir}_graphs")
-        self.consolidated_generator = ConsolidatedReportGenerator(output_dir="consolidated_analysis")
+        self.graph_output_dir = f"{output_dir}_graphs"
+        self.consolidated_output_dir = "consolidated_analysis"
         
         # Ensure output directory exists
         Path(output_dir).mkdir(parents=True, exist_ok=True)
@@ -64,75 +177,113 @@ class DatabaseAnalyzer:
             'db_type': db_type,
             'description': description
         }
-        self.logger.info(f"Added database: {name} ({db_type})")
-    
-    def analyze_all_databases(self) -> Dict[str, Any]:
-        """Analyze all added databases"""
+        self.logger.info("Added database: %s (%s)", name, db_type)
+
+    def add_databases(self, specs: List[Dict[str, Any]]):
+        """Add several databases at once from a list of add_database keyword dicts"""
+        for spec in specs:
+            self.add_database(**spec)
+
+    def analyze_all_databases(self, all_patterns: bool = False) -> Dict[str, Any]:
+        """
+        Analyze all added databases.
+        
+        Cross-database analysis covers common patterns only; all_patterns=True also runs the
+        entity-mapping, architecture, integration, performance and governance analyses.
+        """
         self.logger.info("Starting multi-database analysis")
         results = {}
         
-        for db_name, db_config in self.databases.items():
-            try:
-                self.logger.info(f"Analyzing database: {db_name}")
-                
-                # Extract schema
-                schema_data = self.extractor.extract_relational_schema(
-                    db_config['connection_string']
-                )
-                
-                if not schema_data:
-                    self.logger.error(f"Failed to extract schema for {db_name}")
-                    results[db_name] = {'status': 'error', 'message': 'Schema extraction failed'}
-                    continue
-                
-                # Analyze with Gemini
-                self.logger.info("Starting Gemini schema analysis")
-                analysis = self.gemini_analyzer.analyze_schema(schema_data)
-                
-                if not analysis:
-                    self.logger.error(f"Failed to analyze {db_name} with Gemini")
-                    results[db_name] = {'status': 'error', 'message': 'Gemini analysis failed'}
-                    continue
-                
-                # Store results
-                results[db_name] = {
-                    'status': 'success',
-                    'schema_data': schema_data,
-                    'analysis': analysis,
-                    'config': db_config
+        # Each analysis is dominated by the Gemini round-trip, so run them concurrently
+        if self.databases:
+            max_workers = min(len(self.databases), 8)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {
+                    db_name: executor.submit(self._analyze_one, db_name, db_config)
+                    for db_name, db_config in self.databases.items()
                 }
-                
-                self.logger.info(f"Successfully analyzed: {db_name}")
-                
-            except Exception as e:
-                self.logger.error(f"Error analyzing {db_name}: {e}")
-                results[db_name] = {'status': 'error', 'message': str(e)}
+                # Collect in registration order so output stays deterministic
+                for db_name, future in futures.items():
+                    results[db_name] = future.result()
         
         # Run cross-database pattern analysis if multiple databases
         successful_analyses = {k: v for k, v in results.items() if v.get('status') == 'success'}
         if len(successful_analyses) > 1:
             self.logger.info("Running cross-database pattern analysis")
             try:
-                pattern_analysis = self.pattern_analyzer.analyze_common_patterns(results)
-                results['cross_database_patterns'] = {
-                    'status': 'success',
-                    'analysis': pattern_analysis
-                }
+                if all_patterns:
+                    pattern_analyses = self.pattern_analyzer.analyze_all(results)
+                    # The report reads the common-patterns result from 'analysis'; the other analyses sit alongside it
+                    results['cross_database_patterns'] = {
+                        'status': 'success',
+                        'analysis': pattern_analyses.pop('common_patterns'),
+                        **pattern_analyses
+                    }
+                else:
+                    pattern_analysis = self.pattern_analyzer.analyze_common_patterns(results)
+                    results['cross_database_patterns'] = {
+                        'status': 'success',
+                        'analysis': pattern_analysis
+                    }
             except Exception as e:
-                self.logger.error(f"Pattern analysis failed: {e}")
+                self.logger.error("Pattern analysis failed: %s", e)
                 results['cross_database_patterns'] = {'status': 'error', 'message': str(e)}
         
-        self.logger.info(f"Analysis complete - {len(successful_analyses)} databases analyzed")
+        self.logger.info("Analysis complete - %d databases analyzed", len(successful_analyses))
         return results
     
+    def _analyze_one(self, db_name: str, db_config: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract and analyze a single database, returning its result entry"""
+        try:
+            self.logger.info("Analyzing database: %s", db_name)
+            
+            # Extract schema
+            schema_data = self.extractor.extract_relational_schema(
+                db_config['connection_string']
+            )
+            
+            if not schema_data:
+                self.logger.error("Failed to extract schema for %s", db_name)
+                return {'status': 'error', 'message': 'Schema extraction failed'}
+            
+            # Analyze with Gemini
+            self.logger.info("Starting Gemini schema analysis")
+            analysis = self.gemini_analyzer.analyze_schema(schema_data)
+            
+            if not analysis:
+                self.logger.error("Failed to analyze %s with Gemini", db_name)
+                return {'status': 'error', 'message': 'Gemini analysis failed'}
+            
+            result = {
+                'status': 'success',
+                'schema_data': schema_data,
+                'analysis': analysis,
+                'config': db_config
+            }
+            
+            self.logger.info("Successfully analyzed: %s", db_name)
+            return result
+            
+        except Exception as e:
+            self.logger.error("Error analyzing %s: %s", db_name, e)
+            return {'status': 'error', 'message': str(e)}
+    
     def export_results(self, results: Dict[str, Any]):
         """Export analysis results to files"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        # Export individual database results
-        for db_name, result in results.items():
-            if result.get('status') == 'success' and db_name != 'cross_database_patterns':
-                self._export_database_result(db_name, result, timestamp)
+        # Successful per-database results, shared by the JSON exports and the per-database reports
+        exportable = [
+            (db_name, result) for db_name, result in results.items()
+            if result.get('status') == 'success' and db_name != 'cross_database_patterns'
+        ]
+        
+        # Export individual database results; each file is independent, so write them concurrently
+        if exportable:
+            with ThreadPoolExecutor(max_workers=min(len(exportable), 8)) as executor:
+                for future in [executor.submit(self._export_database_result, db_name, result, timestamp)
+                               for db_name, result in exportable]:
+                    future.result()
         
         # Export cross-database patterns
         if 'cross_database_patterns' in results:
@@ -141,11 +292,8 @@ class DatabaseAnalyzer:
         # Generate comprehensive report
         self.generate_comprehensive_report(results, timestamp)
         
-        # Generate graphs for each database
-        self._generate_all_graphs(results, timestamp)
-        
-        # Generate consolidated reports
-        self._generate_consolidated_reports(results, timestamp)
+        # Generate graphs and consolidated reports for each database
+        self._generate_database_reports(exportable)
     
     def _export_database_result(self, db_name: str, result: Dict[str, Any], timestamp: str):
         """Export individual database analysis result"""
@@ -159,34 +307,34 @@ class DatabaseAnalyzer:
             'analysis': result['analysis']
         }
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False)
+        with open(filename, 'w', encoding='utf-8', buffering=_JSON_WRITE_BUFFER) as f:
+            json.dump(export_data, f, ensure_ascii=False, separators=(',', ':'))
         
-        self.logger.info(f"Exported {db_name} analysis to {filename}")
+        self.logger.info("Exported %s analysis to %s", db_name, filename)
     
     def _export_cross_database_result(self, result: Dict[str, Any], timestamp: str):
         """Export cross-database pattern analysis result"""
         filename = f"{self.output_dir}/cross_database_patterns_{timestamp}.json"
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(result, f, indent=2, ensure_ascii=False)
+        with open(filename, 'w', encoding='utf-8', buffering=_JSON_WRITE_BUFFER) as f:
+            json.dump(result, f, ensure_ascii=False, separators=(',', ':'))
         
-        self.logger.info(f"Exported cross-database patterns to {filename}")
+        self.logger.info("Exported cross-database patterns to %s", filename)
     
     def generate_comprehensive_report(self, results: Dict[str, Any], timestamp: str):
         """Generate comprehensive Markdown report"""
         filename = f"{self.output_dir}/reverse_engineering_report_{timestamp}.md"
         
-        with open(filename, 'w', encoding='utf-8') as f:
-            f.write(self._generate_report_content(results, timestamp))
+        with open(filename, 'w', encoding='utf-8', buffering=_JSON_WRITE_BUFFER) as f:
+            f.writelines(self._iter_report_chunks(results, timestamp))
         
-        self.logger.info(f"Comprehensive report generated: {filename}")
+        self.logger.info("Comprehensive report generated: %s", filename)
     
-    def _generate_report_content(self, results: Dict[str, Any], timestamp: str) -> str:
-        """Generate the content for the comprehensive report"""
+    def _iter_report_chunks(self, results: Dict[str, Any], timestamp: str) -> Iterator[str]:
+        """Yield the comprehensive report section by section, for writing without building one string"""
         successful_analyses = {k: v for k, v in results.items() if v.get('status') == 'success'}
         
-        content = f"""# Database Reverse Engineering Report
+        yield f"""# Database Reverse Engineering Report
 **Generated:** {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
 **Analysis Type:** Multi-Database Pattern Analysis
 
@@ -208,34 +356,37 @@ This comprehensive reverse engineering analysis examines multiple database imple
                 
             analysis = result['analysis']
             reverse_eng = analysis.get('reverse_engineering_analysis', {})
+            domain = reverse_eng.get('business_domain_identification', {})
+            architecture = reverse_eng.get('data_model_architecture', {})
+            integrity = analysis.get('data_quality_assessment', {}).get('integrity_analysis', {})
             
-            content += f"""### {db_name.replace('_', ' ').title()}
+            yield f"""### {db_name.replace('_', ' ').title()}
 
 #### Business Domain
-- **Primary Domain:** {reverse_eng.get('business_domain_identification', {}).get('primary_domain', 'Unknown')}
-- **Confidence:** {reverse_eng.get('business_domain_identification', {}).get('confidence_score', 0)}%
-- **Sub-domains:** {', '.join(reverse_eng.get('business_domain_identification', {}).get('sub_domains', []))}
+- **Primary Domain:** {domain.get('primary_domain', 'Unknown')}
+- **Confidence:** {domain.get('confidence_score', 0)}%
+- **Sub-domains:** {', '.join(domain.get('sub_domains', []))}
 
 #### Data Model Architecture
-- **Design Pattern:** {reverse_eng.get('data_model_architecture', {}).get('design_pattern', 'Unknown')}
-- **Normalization Level:** {reverse_eng.get('data_model_architecture', {}).get('normalization_level', 'Unknown')}
-- **Architectural Style:** {reverse_eng.get('data_model_architecture', {}).get('architectural_style', 'Unknown')}
-- **Flexibility Score:** {reverse_eng.get('data_model_architecture', {}).get('flexibility_score', 0)}/100
+- **Design Pattern:** {architecture.get('design_pattern', 'Unknown')}
+- **Normalization Level:** {architecture.get('normalization_level', 'Unknown')}
+- **Architectural Style:** {architecture.get('architectural_style', 'Unknown')}
+- **Flexibility Score:** {architecture.get('flexibility_score', 0)}/100
 
 #### Core Entities
 """
             
             entities = reverse_eng.get('entity_relationship_mapping', {}).get('core_entities', [])
             for entity in entities[:5]:  # Show first 5
-                content += f"""- **{entity.get('entity_name', 'Unknown')}** ({entity.get('table_name', 'Unknown')})
+                yield f"""- **{entity.get('entity_name', 'Unknown')}** ({entity.get('table_name', 'Unknown')})
   - Purpose: {entity.get('business_purpose', 'Unknown')}
 """
             
-            content += f"""
+            yield f"""
 #### Data Quality Assessment
-- **Referential Integrity:** {analysis.get('data_quality_assessment', {}).get('integrity_analysis', {}).get('referential_integrity', 'Unknown')}
-- **Data Consistency:** {analysis.get('data_quality_assessment', {}).get('integrity_analysis', {}).get('data_consistency', 'Unknown')}
-- **Completeness Score:** {analysis.get('data_quality_assessment', {}).get('integrity_analysis', {}).get('completeness_score', 0)}/100
+- **Referential Integrity:** {integrity.get('referential_integrity', 'Unknown')}
+- **Data Consistency:** {integrity.get('data_consistency', 'Unknown')}
+- **Completeness Score:** {integrity.get('completeness_score', 0)}/100
 
 #### Performance Analysis
 **Identified Bottlenecks:**
@@ -243,24 +394,24 @@ This comprehensive reverse engineering analysis examines multiple database imple
             
             bottlenecks = analysis.get('performance_analysis', {}).get('bottleneck_identification', [])
             for bottleneck in bottlenecks[:3]:
-                content += f"- {bottleneck}\n"
+                yield f"- {bottleneck}\n"
             
-            content += f"""
+            yield """
 #### Primary Use Cases
 """
             
             use_cases = analysis.get('use_case_analysis', {}).get('primary_use_cases', [])
             for use_case in use_cases[:3]:
-                content += f"""- **{use_case.get('use_case', 'Unknown')}**
+                yield f"""- **{use_case.get('use_case', 'Unknown')}**
   - {use_case.get('description', 'No description')}
   - Business Value: {use_case.get('business_value', 'Unknown')}
 """
             
-            content += "\n"
+            yield "\n"
         
         # Cross-database patterns
         if 'cross_database_patterns' in successful_analyses:
-            content += """## Cross-Database Pattern Analysis
+            yield """## Cross-Database Pattern Analysis
 
 ### Common Architectural Patterns
 """
@@ -271,109 +422,46 @@ This comprehensive reverse engineering analysis examines multiple database imple
             # Add cross-database insights
             domain_analysis = reverse_eng.get('domain_analysis', {})
             if domain_analysis:
-                content += f"- **Domain Patterns:** {domain_analysis.get('common_patterns', [])}\n"
+                yield f"- **Domain Patterns:** {domain_analysis.get('common_patterns', [])}\n"
             
             arch_comparison = reverse_eng.get('architectural_pattern_comparison', {})
             if arch_comparison:
-                content += f"- **Architecture Comparison:** {arch_comparison.get('key_differences', [])}\n"
+                yield f"- **Architecture Comparison:** {arch_comparison.get('key_differences', [])}\n"
         
-        content += f"""
-## Recommendations
-
-### Immediate Actions
-1. **Data Quality Improvement:** Address identified data quality issues
-2. **Performance Optimization:** Implement missing indexes and query optimizations
-3. **Security Enhancement:** Implement proper PII handling and access controls
-
-### Medium-term Improvements
-1. **Architecture Modernization:** Consider microservices architecture
-2. **Integration Strategy:** Implement unified data model and API layer
-3. **Scalability Planning:** Design for horizontal scaling
-
-### Long-term Considerations
-1. **Event-driven Architecture:** Implement real-time data processing
-2. **Advanced Analytics:** Build comprehensive data warehouse
-3. **AI/ML Integration:** Leverage data for predictive analytics
-
-## Conclusion
-
-This reverse engineering analysis provides comprehensive insights into the data models, business logic, and integration opportunities across multiple database platforms. The findings can guide:
-- Platform migration strategies
-- Integration architecture design
-- Performance optimization efforts
-- Data governance implementation
-- Scalability planning
-
-The analysis demonstrates the value of automated schema analysis in understanding complex data ecosystems and accelerating engineering efforts.
-"""
-        
-        return content
+        yield _REPORT_CLOSING
     
-    def _generate_all_graphs(self, results: Dict[str, Any], timestamp: str):
-        """Generate graphs for all analyzed databases"""
-        successful_analyses = {k: v for k, v in results.items() if v.get('status') == 'success'}
+    def _generate_database_reports(self, tasks: List[Tuple[str, Dict[str, Any]]]):
+        """Generate graphs, HTML and consolidated reports for each successful (db_name, result), one worker process per database"""
+        if not tasks:
+            return
         
-        for db_name, result in successful_analyses.items():
-            if db_name == 'cross_database_patterns':
-                continue
-            
-            try:
-                # Get database path from connection string
-                connection_string = result['config']['connection_string']
-                if connection_string.startswith('sqlite:///'):
-                    db_path = connection_string.replace('sqlite:///', '')
-                else:
-                    db_path = connection_string
-                
-                # Set database for graph generation
-                self.graph_generator.set_database(db_path, result['analysis'])
-                
-                # Generate all graphs
-                graph_files = self.graph_generator.generate_all_graphs(db_name)
-                
-                # Generate HTML report
-                if graph_files:
-                    html_report = self.graph_generator.generate_html_report(db_name, graph_files)
-                    if html_report:
-                        self.logger.info(f"Generated HTML report: {html_report}")
-                
-            except Exception as e:
-                self.logger.error(f"Error generating graphs for {db_name}: {e}")
-    
-    def _generate_consolidated_reports(self, results: Dict[str, Any], timestamp: str):
-        """Generate consolidated reports for each database"""
-        successful_analyses = {k: v for k, v in results.items() if v.get('status') == 'success'}
+        graph_dir = self.graph_output_dir
+        consolidated_dir = self.consolidated_output_dir
         
-        for db_name, result in successful_analyses.items():
-            if db_name == 'cross_database_patterns':
-                continue
-            
-            try:
-                # Get database path from connection string
-                connection_string = result['config']['connection_string']
-                if connection_string.startswith('sqlite:///'):
-                    db_path = connection_string.replace('sqlite:///', '')
-                else:
-                    db_path = connection_string
-                
-                # Get graph files
-                graph_dir = f"{self.output_dir}_graphs"
-                graph_files = {}
-                if os.path.exists(graph_dir):
-                    for file in os.listdir(graph_dir):
-                        if file.startswith(f"{db_name}_") and file.endswith('.png'):
-                            graph_type = file.replace(f"{db_name}_", "").replace('.png', '')
-                            graph_files[graph_type] = os.path.join(graph_dir, file)
-                
-                # Generate consolidated report
-                consolidated_file = self.consolidated_generator.generate_consolidated_report(
-                    db_path, db_name, result, graph_files
-                )
-                
-                self.logger.info(f"Generated consolidated report: {consolidated_file}")
-                
-            except Exception as e:
-                self.logger.error(f"Error generating consolidated report for {db_name}: {e}")
+        # Rendering is CPU-bound Matplotlib/Plotly work, so separate processes sidestep the GIL;
+        # a single database is rendered in-process to skip the worker start-up cost
+        if len(tasks) == 1:
+            db_name, result = tasks[0]
+            self._log_report_messages(_render_database_reports(graph_dir, consolidated_dir, db_name, result))
+            return
+        
+        # Spawned workers start clean instead of forking a parent that holds analyzer threads and gRPC channels
+        with ProcessPoolExecutor(max_workers=min(len(tasks), os.cpu_count() or 1),
+                                 mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = {
+                executor.submit(_render_database_reports, graph_dir, consolidated_dir, db_name, result): db_name
+                for db_name, result in tasks
+            }
+            for future in as_completed(futures):
+                try:
+                    self._log_report_messages(future.result())
+                except Exception as e:
+                    self.logger.error("Error generating reports for %s: %s", futures[future], e)
+    
+    def _log_report_messages(self, messages: List[Tuple[int, str]]):
+        """Log the (level, message) pairs returned by _render_database_reports"""
+        for level, message in messages:
+            self.logger.log(level, message)
     
     def cleanup_temporary_files(self, keep_consolidated: bool = True):
         """Clean up temporary analysis files, keeping only consolidated reports"""
@@ -382,18 +470,18 @@ The analysis demonstrates the value of automated schema analysis in understandin
         try:
             # Remove individual analysis directories
             if os.path.exists(self.output_dir):
-                shutil.rmtree(self.output_dir)
+                _remove_tree(self.output_dir)
                 print(f"   ✅ Removed: {self.output_dir}")
             
             # Remove graph directories
-            graph_dir = f"{self.output_dir}_graphs"
+            graph_dir = self.graph_output_dir
             if os.path.exists(graph_dir):
-                shutil.rmtree(graph_dir)
+                _remove_tree(graph_dir)
                 print(f"   ✅ Removed: {graph_dir}")
             
             # Keep consolidated analysis directory
-            if keep_consolidated and os.path.exists("consolidated_analysis"):
-                print(f"   📁 Kept: consolidated_analysis/ (consolidated reports)")
+            if keep_consolidated and os.path.exists(self.consolidated_output_dir):
+                print(f"   📁 Kept: {self.consolidated_output_dir}/ (consolidated reports)")
             
             print("✅ Cleanup completed successfully!")
             
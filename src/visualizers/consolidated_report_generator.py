@@ -6,17 +6,21 @@ Combines all analysis results into a single comprehensive output file
 
 import os
 import json
-import pandas as pd
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 import sqlite3
+from contextlib import closing
+
+from ..extractors.row_counts import count_rows
 
 class ConsolidatedReportGenerator:
     """Generates a single consolidated report combining all analysis results"""
     
     def __init__(self, output_dir: str = "consolidated_analysis"):
         self.output_dir = output_dir
+        # db_path -> schema data, shared by the Markdown, JSON and HTML outputs of one report
+        self._schema_cache: Dict[str, Dict[str, Dict[str, Any]]] = {}
         self.ensure_output_dir()
     
     def ensure_output_dir(self):
@@ -30,6 +34,9 @@ class ConsolidatedReportGenerator:
         
         print(f"📋 Generating consolidated report for {db_name}...")
         
+        # Read the schema afresh for each report; it is reused only across this report's outputs
+        self._schema_cache.clear()
+        
         # Extract key information
         analysis = analysis_results.get('analysis', {})
         reverse_eng = analysis.get('reverse_engineering_analysis', {})
@@ -292,6 +299,7 @@ For questions or additional analysis, refer to the detailed JSON data or individ
         """Create HTML version of the consolidated report"""
         
         timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        display_db = db_name.title()
         
         html_content = f"""
 <!DOCTYPE html>
@@ -299,7 +307,7 @@ For questions or additional analysis, refer to the detailed JSON data or individ
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{db_name.title()} Database - Consolidated Analysis Report</title>
+    <title>{display_db} Database - Consolidated Analysis Report</title>
     <style>
         body {{
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
@@ -409,7 +417,7 @@ For questions or additional analysis, refer to the detailed JSON data or individ
 </head>
 <body>
     <div class="container">
-        <h1>🎯 {db_name.title()} Database - Consolidated Analysis Report</h1>
+        <h1>🎯 {display_db} Database - Consolidated Analysis Report</h1>
         
         <div class="summary-box">
             <h3>📊 Analysis Summary</h3>
@@ -612,8 +620,9 @@ For questions or additional analysis, refer to the detailed JSON data or individ
                 filename = os.path.basename(filepath)
                 # Create relative path for markdown embedding
                 relative_path = f"./{os.path.basename(os.path.dirname(filepath))}/{filename}"
-                result.append(f"- **{graph_type.replace('_', ' ').title()}:** {filename}")
-                result.append(f"![{graph_type.replace('_', ' ').title()}]({relative_path})")
+                graph_name = graph_type.replace('_', ' ').title()
+                result.append(f"- **{graph_name}:** {filename}")
+                result.append(f"![{graph_name}]({relative_path})")
                 result.append("")  # Add empty line for better markdown formatting
         
         return "\n".join(result)
@@ -621,70 +630,52 @@ For questions or additional analysis, refer to the detailed JSON data or individ
     def _get_schema_overview(self, db_path: str) -> str:
         """Get schema overview information"""
         try:
-            conn = sqlite3.connect(db_path)
-            
-            # Get table information
-            tables_query = "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
-            tables = pd.read_sql_query(tables_query, conn)
-            
-            if tables.empty:
-                return "No tables found"
-            
-            result = []
-            for table_name in tables['name']:
-                # Get column count
-                cols_query = f"PRAGMA table_info(`{table_name}`)"
-                cols = pd.read_sql_query(cols_query, conn)
-                
-                # Get row count
-                try:
-                    count_query = f"SELECT COUNT(*) as count FROM `{table_name}`"
-                    count = pd.read_sql_query(count_query, conn)
-                    row_count = count['count'].iloc[0]
-                except:
-                    row_count = 0
-                
-                result.append(f"- **{table_name}:** {len(cols)} columns, {row_count:,} rows")
-            
-            conn.close()
-            return "\n".join(result)
-            
+            schema = self._walk_schema(db_path)
         except Exception as e:
             return f"Error retrieving schema: {e}"
+        
+        if not schema:
+            return "No tables found"
+        
+        return "\n".join(
+            f"- **{table_name}:** {info['columns']} columns, {info['rows']:,} rows"
+            for table_name, info in schema.items()
+        )
     
     def _get_schema_data(self, db_path: str) -> Dict[str, Any]:
         """Get structured schema data"""
         try:
-            conn = sqlite3.connect(db_path)
-            
+            # Copy so the caller's structure is not the cached one
+            return dict(self._walk_schema(db_path))
+        except Exception as e:
+            return {"error": str(e)}
+    
+    def _walk_schema(self, db_path: str) -> Dict[str, Dict[str, Any]]:
+        """Read table columns and row counts once per database file for the current report"""
+        cached = self._schema_cache.get(db_path)
+        if cached is not None:
+            return cached
+        
+        with closing(sqlite3.connect(db_path)) as conn:
             tables_query = "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
-            tables = pd.read_sql_query(tables_query, conn)
+            tables = [row[0] for row in conn.execute(tables_query)]
             
+            row_counts = count_rows(conn, tables, lambda name: f"`{name}`")
             schema_data = {}
-            for table_name in tables['name']:
+            for table_name in tables:
                 # Get column information
-                cols_query = f"PRAGMA table_info(`{table_name}`)"
-                cols = pd.read_sql_query(cols_query, conn)
-                
-                # Get row count
-                try:
-                    count_query = f"SELECT COUNT(*) as count FROM `{table_name}`"
-                    count = pd.read_sql_query(count_query, conn)
-                    row_count = count['count'].iloc[0]
-                except:
-                    row_count = 0
+                cursor = conn.execute(f"PRAGMA table_info(`{table_name}`)")
+                keys = [desc[0] for desc in cursor.description]
+                cols = [dict(zip(keys, row)) for row in cursor]
                 
                 schema_data[table_name] = {
                     "columns": len(cols),
-                    "rows": row_count,
-                    "column_details": cols.to_dict('records')
+                    "rows": row_counts[table_name] or 0,
+                    "column_details": cols
                 }
-            
-            conn.close()
-            return schema_data
-            
-        except Exception as e:
-            return {"error": str(e)}
+        
+        self._schema_cache[db_path] = schema_data
+        return schema_data
     
     def _get_file_size(self, file_path: str) -> str:
         """Get file size in human readable format"""
@@ -29,6 +29,7 @@ class DatabaseGraphGenerator:
         self.output_dir = output_dir
         self.db_path = None
         self.analysis_data = None
+        self._shared_conn = None  # Open for the duration of generate_all_graphs
         self.ensure_output_dir()
     
     def ensure_output_dir(self):
@@ -40,6 +41,21 @@ class DatabaseGraphGenerator:
         self.db_path = db_path
         self.analysis_data = analysis_data or {}
     
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database with read-side tuning: bigger page cache, mmap I/O, in-memory temp tables"""
+        if self._shared_conn is not None:
+            return self._shared_conn
+        conn = sqlite3.connect(self.db_path)
+        conn.execute("PRAGMA cache_size=-65536")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+    
+    def _release(self, conn: sqlite3.Connection):
+        """Close a connection from _connect unless it is the one shared across generate_all_graphs"""
+        if conn is not self._shared_conn:
+            conn.close()
+    
     def generate_all_graphs(self, db_name: str = "database") -> Dict[str, str]:
         """Generate all available graphs for the database"""
         if not self.db_path:
@@ -50,6 +66,9 @@ class DatabaseGraphGenerator:
         graph_files = {}
         
         try:
+            # Every graph reads the same file, so open it (and apply the PRAGMAs) once for all of them
+            self._shared_conn = self._connect()
+            
             # 1. Schema Overview Graph
             schema_file = self.generate_schema_overview(db_name)
             if schema_file:
@@ -99,11 +118,15 @@ class DatabaseGraphGenerator:
             import traceback
             traceback.print_exc()
             return {}
+        finally:
+            if self._shared_conn is not None:
+                self._shared_conn.close()
+                self._shared_conn = None
     
     def generate_schema_overview(self, db_name: str) -> Optional[str]:
         """Generate schema overview visualization"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             
             # Get table information
             tables_query = """
@@ -167,7 +190,7 @@ class DatabaseGraphGenerator:
             plt.savefig(filename, dpi=300, bbox_inches='tight')
             plt.close()
             
-            conn.close()
+            self._release(conn)
             return filename
             
         except Exception as e:
@@ -177,7 +200,7 @@ class DatabaseGraphGenerator:
     def generate_entity_relationship_diagram(self, db_name: str) -> Optional[str]:
         """Generate entity relationship diagram"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             
             # Get foreign key information
             fk_query = """
@@ -247,7 +270,7 @@ class DatabaseGraphGenerator:
             plt.savefig(filename, dpi=300, bbox_inches='tight')
             plt.close()
             
-            conn.close()
+            self._release(conn)
             return filename
             
         except Exception as e:
@@ -257,7 +280,7 @@ class DatabaseGraphGenerator:
     def generate_table_size_distribution(self, db_name: str) -> Optional[str]:
         """Generate table size distribution visualization"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             
             # Get table sizes
             size_query = """
@@ -315,7 +338,7 @@ class DatabaseGraphGenerator:
             plt.savefig(filename, dpi=300, bbox_inches='tight')
             plt.close()
             
-            conn.close()
+            self._release(conn)
             return filename
             
         except Exception as e:
@@ -325,7 +348,7 @@ class DatabaseGraphGenerator:
     def generate_data_type_distribution(self, db_name: str) -> Optional[str]:
         """Generate data type distribution visualization"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             
             # Get data types for all tables
             tables_query = "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
@@ -390,7 +413,7 @@ class DatabaseGraphGenerator:
             plt.savefig(filename, dpi=300, bbox_inches='tight')
             plt.close()
             
-            conn.close()
+            self._release(conn)
             return filename
             
         except Exception as e:
@@ -400,7 +423,7 @@ class DatabaseGraphGenerator:
     def generate_index_analysis(self, db_name: str) -> Optional[str]:
         """Generate index analysis visualization"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             
             # Get index information
             tables_query = "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
@@ -471,7 +494,7 @@ class DatabaseGraphGenerator:
             plt.savefig(filename, dpi=300, bbox_inches='tight')
             plt.close()
             
-            conn.close()
+            self._release(conn)
             return filename
             
         except Exception as e:
@@ -481,7 +504,7 @@ class DatabaseGraphGenerator:
     def generate_foreign_key_analysis(self, db_name: str) -> Optional[str]:
         """Generate foreign key analysis visualization"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             
             # Get foreign key information
             tables_query = "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
@@ -547,7 +570,7 @@ class DatabaseGraphGenerator:
             plt.savefig(filename, dpi=300, bbox_inches='tight')
             plt.close()
             
-            conn.close()
+            self._release(conn)
             return filename
             
         except Exception as e:
@@ -621,7 +644,7 @@ class DatabaseGraphGenerator:
     def generate_performance_insights(self, db_name: str) -> Optional[str]:
         """Generate performance insights visualization"""
         try:
-            conn = sqlite3.connect(self.db_path)
+            conn = self._connect()
             
             # Get table sizes for performance analysis
             tables_query = "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
@@ -704,7 +727,7 @@ class DatabaseGraphGenerator:
             plt.savefig(filename, dpi=300, bbox_inches='tight')
             plt.close()
             
-            conn.close()
+            self._release(conn)
             return filename
             
         except Exception as e:
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Tests for PatternAnalyzer response handling; the Gemini model is replaced with a stub
+"""
+
+import asyncio
+import os
+import sys
+
+import pytest
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+pytest.importorskip('google.generativeai')
+
+from src.analyzers.gemini_analyzer import GeminiConfig
+from src.analyzers.pattern_analyzer import PatternAnalyzer
+
+
+class _Response:
+    def __init__(self, text):
+        self.text = text
+
+
+class _StubModel:
+    """Stands in for genai.GenerativeModel, answering from a callback and recording prompts"""
+    
+    def __init__(self, answer):
+        self.answer = answer
+        self.prompts = []
+    
+    def generate_content(self, prompt, request_options=None):
+        self.prompts.append(prompt)
+        return _Response(self.answer(prompt))
+    
+    async def generate_content_async(self, prompt, request_options=None):
+        return self.generate_content(prompt, request_options)
+
+
+DATABASES = {
+    'shop_a': {'status': 'success', 'analysis': {'domain_analysis': {'key_business_entities': ['Customer']}}},
+    'shop_b': {'status': 'success', 'analysis': {'domain_analysis': {'key_business_entities': ['Customer', 'Order']}}},
+}
+
+
+@pytest.fixture
+def analyzer():
+    analyzer = PatternAnalyzer(GeminiConfig(api_key='test-key', cache_dir=None))
+    analyzer.model = analyzer.light_model = _StubModel(lambda prompt: '{"ok": true}')
+    return analyzer
+
+
+def test_error_response_shape(analyzer):
+    response = analyzer._create_error_response('quota exceeded')
+    
+    assert response == {
+        "error": "quota exceeded",
+        "domain_confirmation": {"confirmed_domain": "Unknown", "confidence_score": 0},
+        "common_attributes": {"shared_entities": [], "shared_relationships": []},
+        "integration_opportunities": {
+            "data_standardization": [],
+            "api_unification": [],
+            "data_migration_paths": []
+        }
+    }
+
+
+def test_error_responses_do_not_share_state(analyzer):
+    first = analyzer._create_error_response('first')
+    first['common_attributes']['shared_entities'].append('Customer')
+    first['domain_confirmation']['confidence_score'] = 99
+    
+    second = analyzer._create_error_response('second')
+    
+    assert second['common_attributes']['shared_entities'] == []
+    assert second['domain_confirmation']['confidence_score'] == 0
+
+
+def test_failed_common_patterns_keeps_full_error_structure(analyzer):
+    def fail(prompt):
+        raise RuntimeError("service unavailable")
+    analyzer.model = analyzer.light_model = _StubModel(fail)
+    
+    common = analyzer.analyze_common_patterns(DATABASES)
+    mappings = analyzer.identify_entity_mappings(DATABASES)
+    
+    assert common['error'] == "service unavailable"
+    assert common['integration_opportunities']['api_unification'] == []
+    assert mappings == {"error": "service unavailable"}
+
+
+@pytest.mark.parametrize('text', [
+    '{"a": 1}',
+    '```json\n{"a": 1}\n```',
+    'Here is the analysis: {"a": 1} Let me know if you need more.',
+    '{"a": 1}\n{"b": 2}',
+])
+def test_parse_response_decodes_first_object(analyzer, text):
+    assert analyzer._parse_response(text) == {"a": 1}
+
+
+def test_parse_response_keeps_nested_braces_in_strings(analyzer):
+    assert analyzer._parse_response('{"note": "use {braces}", "n": {"m": 2}} trailing') == \
+        {"note": "use {braces}", "n": {"m": 2}}
+
+
+def test_parse_response_reports_invalid_json(analyzer):
+    result = analyzer._parse_response('{"a": ')
+    
+    assert result['error'] == "Failed to parse JSON response"
+    assert result['raw_response'] == '{"a":'
+
+
+def test_analyze_all_runs_every_analysis_with_one_serialization(analyzer):
+    results = analyzer.analyze_all(DATABASES)
+    
+    assert list(results) == ['common_patterns', 'entity_mappings', 'architecture_patterns',
+                             'integration_strategy', 'performance_comparison', 'data_governance']
+    assert all(result == {"ok": True} for result in results.values())
+    # Every prompt embeds the same analyses JSON after the shared preamble
+    embedded = {prompt.split('\n')[3] for prompt in analyzer.model.prompts}
+    assert len(analyzer.model.prompts) == 6
+    assert len(embedded) == 1
+
+
+def test_analyze_all_async_matches_threaded_results(analyzer):
+    results = asyncio.run(analyzer.analyze_all_async(DATABASES))
+    
+    assert list(results) == ['common_patterns', 'entity_mappings', 'architecture_patterns',
+                             'integration_strategy', 'performance_comparison', 'data_governance']
+    assert all(result == {"ok": True} for result in results.values())
+    assert len(analyzer.model.prompts) == 6
+    # The threaded fan-out builds the same prompts, so it is answered entirely from cache
+    assert analyzer.analyze_all(DATABASES) == results
+    assert len(analyzer.model.prompts) == 6
+
+
+def test_analyze_all_async_reports_failures_per_analysis(analyzer):
+    def fail(prompt):
+        raise RuntimeError("service unavailable")
+    analyzer.model = analyzer.light_model = _StubModel(fail)
+    
+    results = asyncio.run(analyzer.analyze_all_async(DATABASES))
+    
+    assert results['common_patterns']['error'] == "service unavailable"
+    assert results['entity_mappings'] == {"error": "service unavailable"}
+
+
+def test_repeated_prompt_is_answered_from_cache(analyzer):
+    first = analyzer.analyze_common_patterns(DATABASES)
+    first['ok'] = False
+    second = analyzer.analyze_common_patterns(DATABASES)
+    
+    assert second == {"ok": True}
+    assert len(analyzer.model.prompts) == 1
+
+
+def test_unparseable_reply_is_not_cached(analyzer):
+    analyzer.model = analyzer.light_model = _StubModel(lambda prompt: 'not json')
+    
+    analyzer.analyze_common_patterns(DATABASES)
+    analyzer.analyze_common_patterns(DATABASES)
+    
+    assert len(analyzer.model.prompts) == 2
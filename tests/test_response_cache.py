@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Tests for the two-level Gemini response cache
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.analyzers.response_cache import ResponseCache
+
+
+def test_put_then_get_from_memory_and_disk(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    cache.put('key', {'domain': 'retail', 'tables': ['a', 'b']})
+    
+    assert cache.get('key') == {'domain': 'retail', 'tables': ['a', 'b']}
+    assert os.listdir(tmp_path) == ['key.json']
+    # A fresh instance only has the disk copy to go on
+    assert ResponseCache(str(tmp_path)).get('key') == {'domain': 'retail', 'tables': ['a', 'b']}
+
+
+def test_missing_key_returns_none(tmp_path):
+    assert ResponseCache(str(tmp_path)).get('missing') is None
+    assert ResponseCache(None).get('missing') is None
+
+
+def test_get_returns_independent_copies():
+    cache = ResponseCache(None)
+    cache.put('key', {'items': [1]})
+    
+    cache.get('key')['items'].append(2)
+    
+    assert cache.get('key') == {'items': [1]}
+
+
+def test_put_does_not_alias_the_stored_value():
+    cache = ResponseCache(None)
+    value = {'items': [1]}
+    cache.put('key', value)
+    
+    value['items'].append(2)
+    
+    assert cache.get('key') == {'items': [1]}
+
+
+def test_memory_tier_evicts_least_recently_used():
+    cache = ResponseCache(None, max_entries=2)
+    cache.put('a', {'n': 1})
+    cache.put('b', {'n': 2})
+    cache.get('a')
+    cache.put('c', {'n': 3})
+    
+    assert cache.get('b') is None
+    assert cache.get('a') == {'n': 1}
+    assert cache.get('c') == {'n': 3}
+
+
+def test_memory_entries_expire_after_ttl(monkeypatch):
+    cache = ResponseCache(None, ttl=60)
+    cache.put('key', {'n': 1})
+    
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 61)
+    
+    assert cache.get('key') is None
+
+
+def test_disk_entries_expire_by_mtime(tmp_path):
+    ResponseCache(str(tmp_path)).put('key', {'n': 1})
+    stale = time.time() - 120
+    os.utime(tmp_path / 'key.json', (stale, stale))
+    
+    assert ResponseCache(str(tmp_path), ttl=60).get('key') is None
+    assert ResponseCache(str(tmp_path), ttl=600).get('key') == {'n': 1}
+
+
+def test_unreadable_disk_entry_is_ignored(tmp_path):
+    (tmp_path / 'key.json').write_text('{not json', encoding='utf-8')
+    
+    assert ResponseCache(str(tmp_path)).get('key') is None
+
+
+def test_failed_write_leaves_no_temp_file(tmp_path, monkeypatch):
+    def fail_replace(src, dst):
+        raise OSError("disk full")
+    monkeypatch.setattr(os, 'replace', fail_replace)
+    
+    cache = ResponseCache(str(tmp_path))
+    cache.put('key', {'n': 1})
+    
+    assert os.listdir(tmp_path) == []
+    # The in-memory copy is still served
+    assert cache.get('key') == {'n': 1}
+
+
+def test_unserializable_value_is_rejected():
+    with pytest.raises(TypeError):
+        ResponseCache(None).put('key', {'value': object()})
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Tests for batched table row counting and its per-table fallback
+"""
+
+import os
+import sqlite3
+import sys
+
+import pytest
+
+# Add the project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.extractors import row_counts
+from src.extractors.row_counts import count_rows
+
+
+def _quote(name):
+    return f'"{name}"'
+
+
+class _TracingConnection:
+    """Wraps a sqlite3 connection and records every statement run through its cursors"""
+    
+    def __init__(self, conn):
+        self._conn = conn
+        self.statements = []
+    
+    def cursor(self):
+        outer = self
+        cursor = self._conn.cursor()
+        
+        class _Cursor:
+            def execute(self, sql):
+                outer.statements.append(sql)
+                return cursor.execute(sql)
+            
+            def __getattr__(self, name):
+                return getattr(cursor, name)
+        
+        return _Cursor()
+    
+    def rollback(self):
+        self._conn.rollback()
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(':memory:')
+    conn.execute('CREATE TABLE customers (id INTEGER)')
+    conn.execute('CREATE TABLE "order items" (id INTEGER)')
+    conn.execute('CREATE TABLE empty (id INTEGER)')
+    conn.executemany('INSERT INTO customers VALUES (?)', [(i,) for i in range(3)])
+    conn.execute('INSERT INTO "order items" VALUES (1)')
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def test_counts_all_tables_in_one_query(conn):
+    traced = _TracingConnection(conn)
+    
+    counts = count_rows(traced, ['customers', 'order items', 'empty'], _quote)
+    
+    assert counts == {'customers': 3, 'order items': 1, 'empty': 0}
+    assert len(traced.statements) == 1
+    assert traced.statements[0].count('UNION ALL') == 2
+
+
+def test_splits_tables_into_batches(conn, monkeypatch):
+    monkeypatch.setattr(row_counts, 'ROW_COUNT_BATCH_SIZE', 2)
+    traced = _TracingConnection(conn)
+    
+    counts = count_rows(traced, ['customers', 'order items', 'empty'], _quote)
+    
+    assert counts == {'customers': 3, 'order items': 1, 'empty': 0}
+    assert len(traced.statements) == 2
+
+
+def test_failed_batch_falls_back_to_per_table_counts(conn):
+    traced = _TracingConnection(conn)
+    
+    counts = count_rows(traced, ['customers', 'missing', 'order items'], _quote)
+    
+    assert counts == {'customers': 3, 'missing': None, 'order items': 1}
+    # One failed batch, then one query per table
+    assert len(traced.statements) == 4
+
+
+def test_fallback_only_recounts_the_failed_batch(conn, monkeypatch):
+    monkeypatch.setattr(row_counts, 'ROW_COUNT_BATCH_SIZE', 2)
+    traced = _TracingConnection(conn)
+    
+    counts = count_rows(traced, ['customers', 'order items', 'missing'], _quote)
+    
+    assert counts == {'customers': 3, 'order items': 1, 'missing': None}
+    # First batch succeeds; second fails and is retried table by table
+    assert len(traced.statements) == 3
+
+
+def test_no_tables(conn):
+    assert count_rows(conn, [], _quote) == {}
+
+
+def test_extractor_reports_row_counts(tmp_path):
+    pytest.importorskip('pymongo')
+    from src.extractors.schema_extractor import MultiDBSchemaExtractor
+    
+    db_path = tmp_path / 'shop.db'
+    conn = sqlite3.connect(str(db_path))
+    conn.execute('CREATE TABLE customers (id INTEGER PRIMARY KEY)')
+    conn.executemany('INSERT INTO customers VALUES (?)', [(i,) for i in range(4)])
+    conn.commit()
+    conn.close()
+    
+    schema = MultiDBSchemaExtractor().extract_relational_schema(f'sqlite:///{db_path}')
+    
+    assert schema['tables']['customers']['row_count'] == 4
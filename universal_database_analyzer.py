@@ -7,17 +7,25 @@ Analyzes any .db file and generates comprehensive insights with visualizations
 import os
 import sys
 import argparse
+import logging
 from pathlib import Path
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
 
 # Add project root to Python path
 project_root = os.path.dirname(os.path.abspath(__file__))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+log = logging.getLogger(__name__)
+
+# File extensions recognised as SQLite databases
+_DB_SUFFIXES = ('.db', '.sqlite', '.sqlite3')
+
+# Section banners, built once instead of on every summary line
+_EQ50 = "=" * 50
+_EQ60 = "=" * 60
+_EQ70 = "=" * 70
+_DASH60 = "-" * 60
+
 def analyze_database(db_path: str, db_name: str = None, description: str = "", 
                     output_dir: str = None, generate_graphs: bool = True,
                     cleanup_temp: bool = True) -> dict:
@@ -37,8 +45,12 @@ def analyze_database(db_path: str, db_name: str = None, description: str = "",
     if not output_dir:
         output_dir = f"{db_name}_analysis"
     
+    # Load environment variables (deferred so --help and usage paths stay fast)
+    from dotenv import load_dotenv
+    load_dotenv()
+    
     print(f"🔍 {db_name.title()} Database Analysis")
-    print("=" * 50)
+    print(_EQ50)
     print(f"Database: {db_path}")
     print(f"Description: {description}")
     print(f"Output Directory: {output_dir}")
@@ -93,150 +105,167 @@ def analyze_database(db_path: str, db_name: str = None, description: str = "",
         
     except Exception as e:
         print(f"❌ Analysis failed: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("Analysis failed")
         return None
 
+def _trunc(value, limit):
+    """Shorten a model-provided field for one-line display (tolerates null values)"""
+    text = value if isinstance(value, str) else str(value)
+    return text if len(text) <= limit else text[:limit]
+
 def print_detailed_summary(results: dict, db_name: str):
     """Print comprehensive analysis summary"""
-    print("\n" + "="*70)
-    print(f"📊 {db_name.upper()} DATABASE ANALYSIS SUMMARY")
-    print("="*70)
+    out = []
+    out.append("\n" + _EQ70)
+    out.append(f"📊 {db_name.upper()} DATABASE ANALYSIS SUMMARY")
+    out.append(_EQ70)
     
     for db_key, db_result in results.items():
         if isinstance(db_result, dict) and db_result.get('status') == 'success':
             analysis = db_result['analysis']
             
             # Extract analysis components
-            reverse_eng = analysis.get('reverse_engineering_analysis', {})
-            metadata = analysis.get('metadata_extraction', {})
-            quality = analysis.get('data_quality_assessment', {})
-            performance = analysis.get('performance_analysis', {})
-            use_cases = analysis.get('use_case_analysis', {})
-            migration = analysis.get('migration_insights', {})
+            reverse_eng = analysis.get('reverse_engineering_analysis') or {}
+            quality = analysis.get('data_quality_assessment') or {}
+            performance = analysis.get('performance_analysis') or {}
+            use_cases = analysis.get('use_case_analysis') or {}
+            migration = analysis.get('migration_insights') or {}
             
-            print(f"\n🎯 Database: {db_key.replace('_', ' ').title()}")
-            print("-" * 60)
+            out.append(f"\n🎯 Database: {db_key.replace('_', ' ').title()}")
+            out.append(_DASH60)
             
-            # Business Domain Analysis
-            domain_info = reverse_eng.get('business_domain_identification', {})
-            if domain_info:
-                print(f"🏢 Business Domain: {domain_info.get('primary_domain', 'Unknown')}")
-                print(f"📈 Confidence: {domain_info.get('confidence_score', 0)}%")
-                sub_domains = domain_info.get('sub_domains', [])
-                if sub_domains:
-                    print(f"📂 Sub-domains: {', '.join(sub_domains)}")
+            if reverse_eng:
+                # Business Domain Analysis
+                domain_info = reverse_eng.get('business_domain_identification') or {}
+                if domain_info:
+                    get = domain_info.get
+                    out.append(f"🏢 Business Domain: {get('primary_domain', 'Unknown')}")
+                    out.append(f"📈 Confidence: {get('confidence_score', 0)}%")
+                    sub_domains = get('sub_domains', [])
+                    if sub_domains:
+                        out.append(f"📂 Sub-domains: {', '.join(map(str, sub_domains))}")
                 
-                processes = domain_info.get('business_processes', [])
-                if processes:
-                    print(f"⚙️  Business Processes:")
-                    for process in processes[:5]:  # Show first 5
-                        print(f"   • {process}")
+                    processes = get('business_processes', [])
+                    if processes:
+                        out.append(f"⚙️  Business Processes:")
+                        for process in processes[:5]:  # Show first 5
+                            out.append(f"   • {process}")
             
-            # Architecture Analysis
-            arch_info = reverse_eng.get('data_model_architecture', {})
-            if arch_info:
-                print(f"\n🏗️ Architecture Analysis:")
-                print(f"   📐 Design Pattern: {arch_info.get('design_pattern', 'Unknown')}")
-                print(f"   🔧 Architectural Style: {arch_info.get('architectural_style', 'Unknown')}")
-                print(f"   📊 Normalization: {arch_info.get('normalization_level', 'Unknown')}")
-                print(f"   💪 Flexibility Score: {arch_info.get('flexibility_score', 0)}/100")
+                # Architecture Analysis
+                arch_info = reverse_eng.get('data_model_architecture') or {}
+                if arch_info:
+                    get = arch_info.get
+                    out.append(f"\n🏗️ Architecture Analysis:")
+                    out.append(f"   📐 Design Pattern: {get('design_pattern', 'Unknown')}")
+                    out.append(f"   🔧 Architectural Style: {get('architectural_style', 'Unknown')}")
+                    out.append(f"   📊 Normalization: {get('normalization_level', 'Unknown')}")
+                    out.append(f"   💪 Flexibility Score: {get('flexibility_score', 0)}/100")
             
-            # Core Entities
-            entity_info = reverse_eng.get('entity_relationship_mapping', {})
-            entities = entity_info.get('core_entities', [])
-            if entities:
-                print(f"\n🎪 Core Entities ({len(entities)} found):")
-                for entity in entities[:7]:  # Show first 7
-                    table_name = entity.get('table_name', 'Unknown')
-                    entity_name = entity.get('entity_name', 'Unknown')
-                    purpose = entity.get('business_purpose', 'Unknown')[:60]
-                    data_volume = entity.get('data_volume', 'Unknown')
-                    print(f"   • {entity_name} ({table_name})")
-                    print(f"     Purpose: {purpose}...")
-                    print(f"     Data Volume: {data_volume}")
+                # Core Entities
+                entity_info = reverse_eng.get('entity_relationship_mapping') or {}
+                entities = entity_info.get('core_entities', [])
+                if entities:
+                    out.append(f"\n🎪 Core Entities ({len(entities)} found):")
+                    for entity in entities[:7]:  # Show first 7
+                        get = entity.get
+                        table_name = get('table_name', 'Unknown')
+                        entity_name = get('entity_name', 'Unknown')
+                        purpose = _trunc(get('business_purpose', 'Unknown'), 60)
+                        data_volume = get('data_volume', 'Unknown')
+                        out.append(f"   • {entity_name} ({table_name})\n"
+                                   f"     Purpose: {purpose}...\n"
+                                   f"     Data Volume: {data_volume}")
             
-            # Relationships
-            relationships = entity_info.get('relationships', [])
-            if relationships:
-                print(f"\n🔗 Key Relationships ({len(relationships)} found):")
-                for rel in relationships[:5]:  # Show first 5
-                    parent = rel.get('parent_entity', 'Unknown')
-                    child = rel.get('child_entity', 'Unknown')
-                    rel_type = rel.get('relationship_type', 'Unknown')
-                    meaning = rel.get('business_meaning', 'Unknown')[:50]
-                    print(f"   • {parent} ↔ {child} ({rel_type})")
-                    print(f"     Meaning: {meaning}...")
+                # Relationships
+                relationships = entity_info.get('relationships', [])
+                if relationships:
+                    out.append(f"\n🔗 Key Relationships ({len(relationships)} found):")
+                    for rel in relationships[:5]:  # Show first 5
+                        get = rel.get
+                        parent = get('parent_entity', 'Unknown')
+                        child = get('child_entity', 'Unknown')
+                        rel_type = get('relationship_type', 'Unknown')
+                        meaning = _trunc(get('business_meaning', 'Unknown'), 50)
+                        out.append(f"   • {parent} ↔ {child} ({rel_type})\n"
+                                   f"     Meaning: {meaning}...")
             
-            # Data Quality Assessment
-            integrity = quality.get('integrity_analysis', {})
-            if integrity:
-                print(f"\n📊 Data Quality Assessment:")
-                print(f"   ✅ Referential Integrity: {integrity.get('referential_integrity', 'Unknown')}")
-                print(f"   📈 Data Consistency: {integrity.get('data_consistency', 'Unknown')}")
-                print(f"   🎯 Completeness Score: {integrity.get('completeness_score', 0)}/100")
+            if quality:
+                # Data Quality Assessment
+                integrity = quality.get('integrity_analysis') or {}
+                if integrity:
+                    get = integrity.get
+                    out.append(f"\n📊 Data Quality Assessment:")
+                    out.append(f"   ✅ Referential Integrity: {get('referential_integrity', 'Unknown')}")
+                    out.append(f"   📈 Data Consistency: {get('data_consistency', 'Unknown')}")
+                    out.append(f"   🎯 Completeness Score: {get('completeness_score', 0)}/100")
                 
-                accuracy = integrity.get('accuracy_indicators', [])
-                if accuracy:
-                    print(f"   ✨ Accuracy Indicators: {', '.join(accuracy)}")
+                    accuracy = get('accuracy_indicators', [])
+                    if accuracy:
+                        out.append(f"   ✨ Accuracy Indicators: {', '.join(map(str, accuracy))}")
             
-            # Performance Analysis
-            query_patterns = performance.get('query_patterns', [])
-            bottlenecks = performance.get('bottleneck_identification', [])
-            optimizations = performance.get('optimization_opportunities', [])
+            if performance:
+                # Performance Analysis
+                query_patterns = performance.get('query_patterns', [])
+                bottlenecks = performance.get('bottleneck_identification', [])
+                optimizations = performance.get('optimization_opportunities', [])
             
-            if query_patterns or bottlenecks or optimizations:
-                print(f"\n⚡ Performance Analysis:")
+                if query_patterns or bottlenecks or optimizations:
+                    out.append(f"\n⚡ Performance Analysis:")
                 
-                if query_patterns:
-                    print(f"   🔍 Query Patterns:")
-                    for pattern in query_patterns[:4]:
-                        print(f"     • {pattern}")
+                    if query_patterns:
+                        out.append(f"   🔍 Query Patterns:")
+                        for pattern in query_patterns[:4]:
+                            out.append(f"     • {pattern}")
                 
-                if bottlenecks:
-                    print(f"   ⚠️  Bottlenecks:")
-                    for bottleneck in bottlenecks[:4]:
-                        print(f"     • {bottleneck}")
+                    if bottlenecks:
+                        out.append(f"   ⚠️  Bottlenecks:")
+                        for bottleneck in bottlenecks[:4]:
+                            out.append(f"     • {bottleneck}")
                 
-                if optimizations:
-                    print(f"   🚀 Optimization Opportunities:")
-                    for opt in optimizations[:4]:
-                        print(f"     • {opt}")
+                    if optimizations:
+                        out.append(f"   🚀 Optimization Opportunities:")
+                        for opt in optimizations[:4]:
+                            out.append(f"     • {opt}")
             
-            # Use Cases
-            primary_use_cases = use_cases.get('primary_use_cases', [])
-            analytics_opps = use_cases.get('analytics_opportunities', [])
+            if use_cases:
+                # Use Cases
+                primary_use_cases = use_cases.get('primary_use_cases', [])
+                analytics_opps = use_cases.get('analytics_opportunities', [])
             
-            if primary_use_cases:
-                print(f"\n🎯 Primary Use Cases:")
-                for use_case in primary_use_cases[:4]:
-                    uc_name = use_case.get('use_case', 'Unknown')
-                    uc_desc = use_case.get('description', 'No description')[:60]
-                    uc_value = use_case.get('business_value', 'Unknown')
-                    print(f"   • {uc_name}")
-                    print(f"     Description: {uc_desc}...")
-                    print(f"     Business Value: {uc_value}")
+                if primary_use_cases:
+                    out.append(f"\n🎯 Primary Use Cases:")
+                    for use_case in primary_use_cases[:4]:
+                        get = use_case.get
+                        uc_name = get('use_case', 'Unknown')
+                        uc_desc = _trunc(get('description', 'No description'), 60)
+                        uc_value = get('business_value', 'Unknown')
+                        out.append(f"   • {uc_name}\n"
+                                   f"     Description: {uc_desc}...\n"
+                                   f"     Business Value: {uc_value}")
             
-            if analytics_opps:
-                print(f"\n📈 Analytics Opportunities:")
-                for opp in analytics_opps[:4]:
-                    print(f"     • {opp}")
+                if analytics_opps:
+                    out.append(f"\n📈 Analytics Opportunities:")
+                    for opp in analytics_opps[:4]:
+                        out.append(f"     • {opp}")
             
-            # Migration Insights
-            complexity = migration.get('complexity_assessment', '')
-            effort = migration.get('migration_effort', '')
-            if complexity or effort:
-                print(f"\n🔄 Migration Insights:")
-                if complexity:
-                    print(f"   📊 Complexity: {complexity}")
-                if effort:
-                    print(f"   ⏱️  Effort Estimate: {effort}")
+            if migration:
+                # Migration Insights
+                complexity = migration.get('complexity_assessment', '')
+                effort = migration.get('migration_effort', '')
+                if complexity or effort:
+                    out.append(f"\n🔄 Migration Insights:")
+                    if complexity:
+                        out.append(f"   📊 Complexity: {complexity}")
+                    if effort:
+                        out.append(f"   ⏱️  Effort Estimate: {effort}")
     
-    print(f"\n📁 Detailed analysis results saved in: {db_name}_analysis/")
-    print(f"📄 Key files:")
-    print(f"   • reverse_engineering_report_*.md - Comprehensive report")
-    print(f"   • *_analysis_*.json - Detailed AI insights")
-    print(f"   • complete_analysis_*.json - Full analysis data")
+    out.append(f"\n📁 Detailed analysis results saved in: {db_name}_analysis/")
+    out.append(f"📄 Key files:")
+    out.append(f"   • reverse_engineering_report_*.md - Comprehensive report")
+    out.append(f"   • *_analysis_*.json - Detailed AI insights")
+    out.append(f"   • complete_analysis_*.json - Full analysis data")
+    
+    sys.stdout.write("\n".join(out) + "\n")
 
 def show_generated_files(output_dir: str, db_name: str):
     """Show what files were generated"""
@@ -295,8 +324,9 @@ def show_consolidated_reports(db_name: str):
     else:
         print("   Consolidated analysis directory not found")
 
-def batch_analyze_databases(db_directory: str, pattern: str = "*.db", cleanup_temp: bool = True):
-    """Analyze multiple databases in a directory"""
+def batch_analyze_databases(db_directory: str, pattern: str = "*.db", cleanup_temp: bool = True,
+                            jobs: int = 1):
+    """Analyze multiple databases in a directory, optionally several at a time in worker processes"""
     db_path = Path(db_directory)
     if not db_path.exists():
         print(f"❌ Directory not found: {db_directory}")
@@ -313,24 +343,47 @@ def batch_analyze_databases(db_directory: str, pattern: str = "*.db", cleanup_te
     
     print(f"\n🚀 Starting batch analysis...")
     
+    # Arguments for each database, shared by the parallel and serial paths
+    analysis_kwargs = {
+        db_file: dict(
+            db_path=str(db_file),
+            db_name=db_file.stem,
+            description=f"Batch analysis of {db_file.name}",
+            output_dir=f"{db_file.stem}_analysis",
+            cleanup_temp=cleanup_temp
+        )
+        for db_file in db_files
+    }
+    
     results = {}
-    for i, db_file in enumerate(db_files, 1):
-        print(f"\n{'='*60}")
-        print(f"📊 Analyzing {i}/{len(db_files)}: {db_file.name}")
-        print(f"{'='*60}")
+    if jobs > 1:
+        # Each database has its own files and analyzer, so they can run in separate processes
+        from concurrent.futures import ProcessPoolExecutor
         
-        try:
-            result = analyze_database(
-                str(db_file),
-                db_name=db_file.stem,
-                description=f"Batch analysis of {db_file.name}",
-                output_dir=f"{db_file.stem}_analysis",
-                cleanup_temp=cleanup_temp
-            )
-            if result:
-                results[db_file.name] = result
-        except Exception as e:
-            print(f"❌ Failed to analyze {db_file.name}: {e}")
+        with ProcessPoolExecutor(max_workers=min(jobs, len(db_files))) as executor:
+            futures = {
+                db_file: executor.submit(analyze_database, **kwargs)
+                for db_file, kwargs in analysis_kwargs.items()
+            }
+            for db_file, future in futures.items():
+                try:
+                    result = future.result()
+                    if result:
+                        results[db_file.name] = result
+                except Exception as e:
+                    print(f"❌ Failed to analyze {db_file.name}: {e}")
+    else:
+        for i, db_file in enumerate(db_files, 1):
+            print(f"\n{_EQ60}")
+            print(f"📊 Analyzing {i}/{len(db_files)}: {db_file.name}")
+            print(_EQ60)
+            
+            try:
+                result = analyze_database(**analysis_kwargs[db_file])
+                if result:
+                    results[db_file.name] = result
+            except Exception as e:
+                print(f"❌ Failed to analyze {db_file.name}: {e}")
     
     print(f"\n🎉 Batch analysis complete!")
     print(f"✅ Successfully analyzed: {len(results)}/{len(db_files)} databases")
@@ -379,6 +432,9 @@ Examples:
   # Batch analyze all .db files in a directory
   python universal_database_analyzer.py --batch New_DB --pattern "*.db"
   
+  # Batch analyze three databases at a time
+  python universal_database_analyzer.py --batch New_DB --jobs 3
+  
   # Show available databases
   python universal_database_analyzer.py --list
         """
@@ -392,6 +448,7 @@ Examples:
     parser.add_argument('--no-cleanup', action='store_true', help='Keep temporary analysis files')
     parser.add_argument('--batch', help='Batch analyze all databases in directory')
     parser.add_argument('--pattern', default='*.db', help='File pattern for batch analysis (default: *.db)')
+    parser.add_argument('--jobs', type=int, default=1, help='Databases to analyze in parallel in batch mode (default: 1)')
     parser.add_argument('--list', action='store_true', help='List available databases and exit')
     
     args = parser.parse_args()
@@ -404,19 +461,18 @@ Examples:
         # Check New_DB directory
         if os.path.exists('New_DB'):
             print("\n📁 New_DB/ directory:")
-            for file in os.listdir('New_DB'):
-                if file.endswith(('.db', '.sqlite', '.sqlite3')):
-                    file_path = os.path.join('New_DB', file)
-                    size = os.path.getsize(file_path)
-                    print(f"   • {file} ({size:,} bytes)")
+            with os.scandir('New_DB') as entries:
+                for entry in entries:
+                    if entry.is_file() and entry.name.endswith(_DB_SUFFIXES):
+                        print(f"   • {entry.name} ({entry.stat().st_size:,} bytes)")
         
         # Check current directory
-        current_db_files = [f for f in os.listdir('.') if f.endswith(('.db', '.sqlite', '.sqlite3'))]
+        with os.scandir('.') as entries:
+            current_db_files = [entry for entry in entries if entry.is_file() and entry.name.endswith(_DB_SUFFIXES)]
         if current_db_files:
             print("\n📁 Current directory:")
-            for file in current_db_files:
-                size = os.path.getsize(file)
-                print(f"   • {file} ({size:,} bytes)")
+            for entry in current_db_files:
+                print(f"   • {entry.name} ({entry.stat().st_size:,} bytes)")
         
         print(f"\n💡 Usage:")
         print(f"   python universal_database_analyzer.py <database_path>")
@@ -426,7 +482,7 @@ Examples:
     # Batch analysis
     if args.batch:
         cleanup_temp = not args.no_cleanup
-        return 0 if batch_analyze_databases(args.batch, args.pattern, cleanup_temp) else 1
+        return 0 if batch_analyze_databases(args.batch, args.pattern, cleanup_temp, args.jobs) else 1
     
     # Single database analysis
     if not args.database_path: